@@ -0,0 +1,192 @@
+import argparse
+import copy
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from src.environment.game_env import GameEnvironment
+
+
+def load_hyperparameters(file_path):
+    with open(file_path, 'r') as f:
+        return json.load(f)
+
+
+def summarize(latencies, units_per_call=1):
+    # Throughput and latency percentiles (microseconds) from per-call timings in seconds
+    latencies = np.asarray(latencies)
+    total = latencies.sum()
+    return {
+        "calls": len(latencies),
+        "per_sec": len(latencies) * units_per_call / total if total > 0 else 0.0,
+        "mean_us": latencies.mean() * 1e6,
+        "p50_us": np.percentile(latencies, 50) * 1e6,
+        "p90_us": np.percentile(latencies, 90) * 1e6,
+        "p99_us": np.percentile(latencies, 99) * 1e6,
+    }
+
+
+def time_calls(fn, calls, warmup=10):
+    for _ in range(warmup):
+        fn()
+    latencies = np.empty(calls)
+    for i in range(calls):
+        start = time.perf_counter()
+        fn()
+        latencies[i] = time.perf_counter() - start
+    return latencies
+
+
+def make_agent(env, hyperparameters):
+    # Imported here so the environment benchmark does not pay for loading TensorFlow
+    from src.agents.dqn_agent import DQNAgent
+    return DQNAgent(state_size=env.state_size, action_size=env.action_size, hyperparameters=hyperparameters)
+
+
+def fill_memory(agent, env, count):
+    rng = np.random.default_rng(0)
+    states = rng.random((count, env.state_size), dtype=np.float32)
+    actions = rng.integers(env.action_size, size=count)
+    rewards = rng.choice([-0.1, -5.0, 10.0], size=count)
+    next_states = rng.random((count, env.state_size), dtype=np.float32)
+    dones = (rewards != -0.1).astype(np.float32)
+    agent.memory.add_batch(states, actions, rewards, next_states, dones)
+
+
+def benchmark_env_step(env_config, steps):
+    env = GameEnvironment(**env_config)
+    actions = np.random.default_rng(0).integers(env.action_size, size=steps + 10)
+    counter = iter(range(len(actions)))
+
+    def step():
+        _, _, done, _ = env.step(actions[next(counter)])
+        if done:
+            env.reset()
+
+    return summarize(time_calls(step, steps))
+
+
+def benchmark_select_action(agent, env, steps):
+    state = env.reset()
+    agent.epsilon = 0.0  # Measure the greedy path only
+    return summarize(time_calls(lambda: agent.select_action(state), steps))
+
+
+def benchmark_train(agent, env, batch_sizes, updates):
+    fill_memory(agent, env, max(batch_sizes) * 10)
+    results = {}
+    for batch_size in batch_sizes:
+        # per_sec counts training samples processed per second
+        result = summarize(time_calls(lambda: agent.train(batch_size), updates), batch_size)
+        result["updates_per_sec"] = 1e6 / result["mean_us"]
+        results[str(batch_size)] = result
+    return results
+
+
+def check_compiled_network(env, learning_rate, updates=5, batch_size=64, tolerance=1e-4):
+    # Train a compiled and a Keras-fit NeuralNetwork from the same weights on the same batches;
+    # their losses, predictions and weights should agree up to float32 round-off
+    from src.models.neural_network import NeuralNetwork
+
+    compiled = NeuralNetwork((env.state_size,), env.action_size, learning_rate, compiled=True)
+    reference = NeuralNetwork((env.state_size,), env.action_size, learning_rate, compiled=False)
+    reference.model.set_weights(compiled.model.get_weights())
+
+    rng = np.random.default_rng(0)
+    loss_error = 0.0
+    for _ in range(updates):
+        states = rng.random((batch_size, env.state_size), dtype=np.float32)
+        targets = rng.random((batch_size, env.action_size), dtype=np.float32)
+        weights = rng.random(batch_size, dtype=np.float32)
+        loss_error = max(loss_error, abs(compiled.train(states, targets, weights) - reference.train(states, targets, weights)))
+
+    states = rng.random((batch_size, env.state_size), dtype=np.float32)
+    result = {
+        "max_loss_error": loss_error,
+        "max_prediction_error": float(np.abs(compiled.forward(states) - reference.forward(states)).max()),
+        "max_weight_error": float(max(np.abs(a - b).max() for a, b in
+                                      zip(compiled.model.get_weights(), reference.model.get_weights()))),
+    }
+    result["matches"] = all(error <= tolerance for error in result.values())
+    return result
+
+
+def benchmark_run_episode(agent, env, hyperparameters, episodes):
+    from src.training.trainer import Trainer
+
+    hyperparameters = copy.deepcopy(hyperparameters)
+    hyperparameters["render"] = False
+    hyperparameters["checkpoint"] = {"enabled": False}
+    trainer = Trainer(env, agent, hyperparameters)
+    agent.epsilon = hyperparameters["exploration_strategy"]["initial_epsilon"]
+
+    latencies = np.empty(episodes)
+    total_steps = 0
+    for i in range(episodes):
+        start = time.perf_counter()
+        _, steps = trainer.run_episode()
+        latencies[i] = time.perf_counter() - start
+        total_steps += steps
+
+    result = summarize(latencies)
+    result["env_steps_per_sec"] = total_steps / latencies.sum()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the environment, agent and trainer.")
+    parser.add_argument("--config", default="config/hyperparameters.json")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--env-steps", type=int, default=100000)
+    parser.add_argument("--action-steps", type=int, default=10000)
+    parser.add_argument("--train-updates", type=int, default=200)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 64, 128, 256])
+    parser.add_argument("--episodes", type=int, default=20)
+    parser.add_argument("--env-only", action="store_true", help="Only benchmark GameEnvironment.step")
+    parser.add_argument("--check-compiled", action="store_true",
+                        help="Only check that NeuralNetwork(compiled=True) matches compiled=False")
+    args = parser.parse_args()
+
+    hyperparameters = load_hyperparameters(args.config)
+    hyperparameters["checkpoint"] = {"enabled": False}
+
+    if args.check_compiled:
+        env = GameEnvironment(**hyperparameters.get("environment", {}))
+        result = check_compiled_network(env, hyperparameters["learning_rate"])
+        print(f"compiled network: {'OK' if result['matches'] else 'MISMATCH'} " +
+              f"(loss {result['max_loss_error']:.2e}, predictions {result['max_prediction_error']:.2e}, " +
+              f"weights {result['max_weight_error']:.2e})")
+        sys.exit(0 if result["matches"] else 1)
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "env_step": benchmark_env_step(hyperparameters.get("environment", {}), args.env_steps),
+    }
+    print(f"env_step: {results['env_step']['per_sec']:.0f} steps/sec")
+
+    if not args.env_only:
+        env = GameEnvironment(**hyperparameters.get("environment", {}))
+        agent = make_agent(env, hyperparameters)
+
+        results["select_action"] = benchmark_select_action(agent, env, args.action_steps)
+        print(f"select_action: {results['select_action']['per_sec']:.0f} calls/sec")
+
+        results["train"] = benchmark_train(agent, env, args.batch_sizes, args.train_updates)
+        for batch_size, result in results["train"].items():
+            print(f"train[batch={batch_size}]: {result['updates_per_sec']:.1f} updates/sec, "
+                  f"p50 {result['p50_us']:.0f} us")
+
+        results["run_episode"] = benchmark_run_episode(make_agent(env, hyperparameters), env, hyperparameters, args.episodes)
+        print(f"run_episode: {results['run_episode']['env_steps_per_sec']:.0f} env steps/sec")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import argparse
+import json
+import sys
+import time
+
+from main import load_hyperparameters, validate_hyperparameters
+from src.environment.game_env import GameEnvironment
+from src.training.evaluation import evaluate_policy, load_policy_weights
+
+
+def make_environment_config(config_path):
+    return load_hyperparameters(config_path).get("environment", {})
+
+
+def print_summary(summary):
+    print(f"Episodes: {summary['episodes']}, " +
+          f"Success rate: {summary['success_rate']:.2%}, " +
+          f"Mean steps: {summary['mean_steps']:.1f}, " +
+          f"Mean reward: {summary['mean_reward']:.2f} (std {summary['std_reward']:.2f}), " +
+          f"Env steps/sec: {summary['env_steps_per_sec']:.0f}")
+
+
+def cmd_rollout(args):
+    # Random-policy rollouts, no model involved
+    summary = evaluate_policy(None, make_environment_config(args.config), args.episodes,
+                              args.max_steps, seed=args.seed, workers=args.workers)
+    print_summary(summary)
+    return 0
+
+
+def cmd_validate_config(args):
+    errors = validate_hyperparameters(load_hyperparameters(args.config))
+    for error in errors:
+        print(f"error: {error}")
+    if not errors:
+        print(f"{args.config}: OK")
+    return 1 if errors else 0
+
+
+def cmd_evaluate(args):
+    # Greedy evaluation across a process pool with the NumPy backend; TensorFlow is only
+    # imported in this process, and only when the weights are a saved Keras model
+    weights = load_policy_weights(args.weights)
+    summary = evaluate_policy(weights, make_environment_config(args.config), args.episodes,
+                              args.max_steps, args.epsilon, args.seed, args.workers, args.randomize_layouts)
+    print_summary(summary)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+def cmd_solve(args):
+    # Exact solution of the grid by value iteration, optionally scoring saved weights against it
+    from src.agents.tabular_agent import TabularSolver
+
+    hyperparameters = load_hyperparameters(args.config)
+    env = GameEnvironment(**hyperparameters.get("environment", {}))
+    start = time.perf_counter()
+    solver = TabularSolver(env, hyperparameters["discount_factor"], cache_dir=args.cache_dir)
+    elapsed = time.perf_counter() - start
+
+    state = env.reset()
+    for steps in range(1, args.max_steps + 1):
+        state, reward, done, _ = env.step(solver.optimal_action(state))
+        if done:
+            break
+    print(f"Solved in {elapsed * 1000:.1f} ms, " +
+          f"Optimal start value: {solver.values[0]:.3f}, " +
+          f"Optimal episode: {steps} steps, Reward: {reward}")
+
+    if args.weights:
+        from src.models.numpy_network import NumpyQNetwork
+
+        policy = NumpyQNetwork()
+        policy.load(args.weights)
+        score = solver.score(policy.predict)
+        print(f"Policy {args.weights}: " +
+              f"Optimal actions: {score['optimal_action_fraction']:.2%}, " +
+              f"Start value: {score['start_value']:.3f}, " +
+              f"Gap to optimal: {score['value_gap']:.3f}")
+    return 0
+
+
+def cmd_train_offline(args):
+    # Replay-only training from trajectories recorded by Trainer; loads TensorFlow
+    from src.agents.dqn_agent import DQNAgent
+    from src.training.trajectory import train_offline
+
+    hyperparameters = load_hyperparameters(args.config)
+    env = GameEnvironment(**hyperparameters.get("environment", {}))
+    agent = DQNAgent(state_size=env.state_size, action_size=env.action_size, hyperparameters=hyperparameters)
+    train_offline(agent, args.data, args.updates)
+    agent.save_policy(args.save_policy)
+    print(f"Policy saved to {args.save_policy}")
+    return 0
+
+
+def cmd_train(args):
+    from main import main as train_main
+    train_main(args.config)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lightweight entry points for game-simulation-rl.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rollout = subparsers.add_parser("rollout", help="Run random-policy episodes in GameEnvironment")
+    rollout.add_argument("--config", default="config/hyperparameters.json")
+    rollout.add_argument("--episodes", type=int, default=1000)
+    rollout.add_argument("--max-steps", type=int, default=200)
+    rollout.add_argument("--seed", type=int, default=0)
+    rollout.add_argument("--workers", type=int, default=1)
+    rollout.set_defaults(func=cmd_rollout)
+
+    validate = subparsers.add_parser("validate-config", help="Check a hyperparameters file")
+    validate.add_argument("--config", default="config/hyperparameters.json")
+    validate.set_defaults(func=cmd_validate_config)
+
+    evaluate = subparsers.add_parser("evaluate", help="Evaluate saved weights with the NumPy backend")
+    evaluate.add_argument("weights", help="Weights saved with DQNAgent.save_policy, or a saved Keras model")
+    evaluate.add_argument("--config", default="config/hyperparameters.json")
+    evaluate.add_argument("--episodes", type=int, default=100)
+    evaluate.add_argument("--max-steps", type=int, default=200)
+    evaluate.add_argument("--epsilon", type=float, default=0.0)
+    evaluate.add_argument("--seed", type=int, default=0)
+    evaluate.add_argument("--workers", type=int, default=None, help="Defaults to one per CPU")
+    evaluate.add_argument("--randomize-layouts", action="store_true",
+                          help="Draw a new procedural layout per episode (needs environment.obstacle_density)")
+    evaluate.add_argument("--output", default=None, help="Write the summary to this JSON file")
+    evaluate.set_defaults(func=cmd_evaluate)
+
+    solve = subparsers.add_parser("solve", help="Solve GameEnvironment exactly and optionally score .npz weights")
+    solve.add_argument("--config", default="config/hyperparameters.json")
+    solve.add_argument("--weights", default=None, help="Weights saved with DQNAgent.save_policy")
+    solve.add_argument("--cache-dir", default=".cache")
+    solve.add_argument("--max-steps", type=int, default=200)
+    solve.set_defaults(func=cmd_solve)
+
+    train_offline = subparsers.add_parser("train-offline", help="Train the DQN agent from recorded trajectories")
+    train_offline.add_argument("data", help="Directory written by trajectory_recording")
+    train_offline.add_argument("--config", default="config/hyperparameters.json")
+    train_offline.add_argument("--updates", type=int, default=10000)
+    train_offline.add_argument("--save-policy", default="policy_offline.npz")
+    train_offline.set_defaults(func=cmd_train_offline)
+
+    train = subparsers.add_parser("train", help="Train the DQN agent (loads TensorFlow)")
+    train.add_argument("--config", default="config/hyperparameters.json")
+    train.set_defaults(func=cmd_train)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
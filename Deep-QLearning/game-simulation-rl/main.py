@@ -1,26 +1,152 @@
 from src.environment.game_env import GameEnvironment
 from src.agents.dqn_agent import DQNAgent
+from src.agents.tabular_agent import TabularQAgent, TabularSolver
 from src.training.trainer import Trainer
+from src.training.distributed_trainer import DistributedTrainer
 import json
+import os
+from functools import partial
+
+import numpy as np
+
+# Required keys and the checks they must pass
+REQUIRED_HYPERPARAMETERS = {
+    "learning_rate": lambda v: isinstance(v, (int, float)) and v > 0,
+    "discount_factor": lambda v: isinstance(v, (int, float)) and 0 <= v <= 1,
+    "exploration_strategy": lambda v: isinstance(v, dict),
+    "batch_size": lambda v: isinstance(v, int) and v > 0,
+    "memory_size": lambda v: isinstance(v, int) and v > 0,
+    "target_update_frequency": lambda v: isinstance(v, int) and v > 0,
+    "num_episodes": lambda v: isinstance(v, int) and v > 0,
+    "max_steps_per_episode": lambda v: isinstance(v, int) and v > 0,
+    "render": lambda v: isinstance(v, bool),
+}
 
 def load_hyperparameters(file_path):
     with open(file_path, 'r') as f:
         return json.load(f)
 
-def main():
-    hyperparameters = load_hyperparameters('config/hyperparameters.json')
+def validate_hyperparameters(hyperparameters):
+    # Returns a list of problems; an empty list means the config is usable
+    errors = []
+    for key, check in REQUIRED_HYPERPARAMETERS.items():
+        if key not in hyperparameters:
+            errors.append(f"missing key: {key}")
+        elif not check(hyperparameters[key]):
+            errors.append(f"invalid value for {key}: {hyperparameters[key]!r}")
+
+    exploration = hyperparameters.get("exploration_strategy")
+    if isinstance(exploration, dict):
+        for key in ("initial_epsilon", "final_epsilon", "decay_steps"):
+            if key not in exploration:
+                errors.append(f"missing key: exploration_strategy.{key}")
+        if exploration.get("decay_steps", 1) <= 0:
+            errors.append("exploration_strategy.decay_steps must be positive")
+
+    if isinstance(hyperparameters.get("memory_size"), int) and isinstance(hyperparameters.get("batch_size"), int) \
+            and hyperparameters["memory_size"] < hyperparameters["batch_size"]:
+        errors.append("memory_size must be at least batch_size")
+
+    for key, minimum in (("learning_starts", 0), ("train_every", 1), ("gradient_steps", 1), ("n_step", 1),
+                         ("action_repeat", 1)):
+        if key in hyperparameters and not (isinstance(hyperparameters[key], int) and hyperparameters[key] >= minimum):
+            errors.append(f"invalid value for {key}: {hyperparameters[key]!r}")
+
+    agent_type = hyperparameters.get("agent", "dqn")
+    if agent_type not in ("dqn", "tabular", "tabular_oracle"):
+        errors.append(f"unknown agent: {agent_type!r}")
+    elif agent_type != "dqn":
+        # Tabular agents have no replay memory, network policy or checkpoint support
+        for key in ("checkpoint", "distributed"):
+            section = hyperparameters.get(key)
+            if isinstance(section, dict) and section.get("enabled", False):
+                errors.append(f"{key}.enabled is not supported with agent {agent_type!r}")
+
+    environment = hyperparameters.get("environment", {})
+    if isinstance(environment, dict):
+        if not (isinstance(environment.get("grid_size", 10), int) and environment.get("grid_size", 10) >= 2):
+            errors.append(f"invalid value for environment.grid_size: {environment['grid_size']!r}")
+        density = environment.get("obstacle_density")
+        if density is not None and not (isinstance(density, (int, float)) and 0 <= density < 1):
+            errors.append(f"invalid value for environment.obstacle_density: {density!r}")
+
+    # DistributedTrainer never saves or restores checkpoints, so the combination would silently lose progress
+    checkpoint, distributed = hyperparameters.get("checkpoint"), hyperparameters.get("distributed")
+    if isinstance(checkpoint, dict) and isinstance(distributed, dict) \
+            and checkpoint.get("enabled", False) and distributed.get("enabled", False):
+        errors.append("checkpoint.enabled is not supported with distributed.enabled")
+
+    policy_output = hyperparameters.get("policy_output")
+    if policy_output is not None and not (isinstance(policy_output, str) and policy_output.endswith(".npz")):
+        errors.append(f"policy_output must be an .npz path or null: {policy_output!r}")
+
+    for key in ("environment", "prioritized_replay", "distributed", "checkpoint", "trajectory_recording", "profiling"):
+        if key in hyperparameters and not isinstance(hyperparameters[key], dict):
+            errors.append(f"{key} must be an object")
+    return errors
+
+def resolve_environment_seed(hyperparameters):
+    # A procedural layout with a null seed gets one concrete seed per run, so the learner, every
+    # distributed actor and later evaluation share a grid. A checkpointed run keeps its seed on resume
+    environment = dict(hyperparameters.get("environment", {}))
+    if environment.get("obstacle_density") is None or environment.get("seed") is not None:
+        return environment
+
+    checkpoint = hyperparameters.get("checkpoint", {})
+    path = os.path.join(checkpoint.get("directory", "checkpoints"), "environment.json")
+    if checkpoint.get("enabled", False) and checkpoint.get("resume", True) and os.path.exists(path):
+        with open(path, 'r') as f:
+            environment["seed"] = json.load(f)["seed"]
+    else:
+        environment["seed"] = int(np.random.SeedSequence().generate_state(1)[0])
+        if checkpoint.get("enabled", False):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump({"seed": environment["seed"]}, f)
+    print(f"environment.seed is null; using seed {environment['seed']} for the obstacle layout " +
+          "(set it in the config to evaluate on the same grid)")
+    hyperparameters["environment"] = environment
+    return environment
+
+def main(config_path='config/hyperparameters.json'):
+    hyperparameters = load_hyperparameters(config_path)
+    errors = validate_hyperparameters(hyperparameters)
+    if errors:
+        raise ValueError(f"Invalid hyperparameters in {config_path}: " + "; ".join(errors))
     
     # Initialize the game environment
-    env = GameEnvironment()
+    env_factory = partial(GameEnvironment, **resolve_environment_seed(hyperparameters))
+    env = env_factory()
     
-    # Initialize the DQN agent
-    agent = DQNAgent(state_size=env.state_size, action_size=env.action_size, hyperparameters=hyperparameters)
+    # Initialize the agent: DQN by default, or a tabular baseline ("tabular" learns, "tabular_oracle" is pre-solved)
+    agent_type = hyperparameters.get("agent", "dqn")
+    if agent_type == "tabular":
+        agent = TabularQAgent(env, hyperparameters)
+    elif agent_type == "tabular_oracle":
+        solver = TabularSolver(env, hyperparameters["discount_factor"])
+        agent = TabularQAgent(env, hyperparameters, q_values=solver.q_values, learn_online=False)
+    else:
+        agent = DQNAgent(state_size=env.state_size, action_size=env.action_size, hyperparameters=hyperparameters)
     
-    # Initialize the trainer
-    trainer = Trainer(env, agent, hyperparameters)
+    # Initialize the trainer; distributed mode runs actors in separate processes
+    if hyperparameters.get("distributed", {}).get("enabled", False):
+        trainer = DistributedTrainer(env_factory, agent, hyperparameters)
+    else:
+        trainer = Trainer(env, agent, hyperparameters)
     
     # Start the training process
     trainer.train()
 
+    # Save the trained policy for cli.py evaluate/solve; tabular agents have no network to save
+    policy_output = hyperparameters.get("policy_output")
+    if policy_output and hasattr(agent, "save_policy"):
+        agent.save_policy(policy_output)
+        print(f"Policy saved to {policy_output}")
+
+    # Write per-phase timings when profiling is enabled
+    profiling = hyperparameters.get("profiling", {})
+    if profiling.get("enabled", False) and isinstance(trainer, Trainer):
+        trainer.save_timings(profiling.get("output", "timings.csv"))
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,7 +1,9 @@
+import json
+import os
+
 import numpy as np
-from keras.models import Sequential
-from keras.layers import Dense
-from keras.optimizers import Adam
+from src.agents.replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
+from src.models.numpy_network import NumpyQNetwork
 
 class DQNAgent:
     def __init__(self, state_size, action_size, hyperparameters):
@@ -10,13 +12,52 @@ class DQNAgent:
         self.learning_rate = hyperparameters["learning_rate"]
         self.discount_factor = hyperparameters["discount_factor"]
         self.batch_size = hyperparameters["batch_size"]
-        self.memory = []
+        self.memory = self._build_memory(hyperparameters)
         self.epsilon = hyperparameters["exploration_strategy"]["initial_epsilon"]
         self.final_epsilon = hyperparameters["exploration_strategy"]["final_epsilon"]
         self.epsilon_decay = (self.epsilon - self.final_epsilon) / hyperparameters["exploration_strategy"]["decay_steps"]
         self.model = self._build_model()
 
+        # Target network used for bootstrapped targets, synced every target_update_frequency updates
+        self.target_update_frequency = hyperparameters["target_update_frequency"]
+        self.target_model = self._build_model()
+        self.update_target_model()
+        self.train_steps = 0
+
+        # NumPy mirror of the model weights used for action selection
+        self.policy = NumpyQNetwork(self.model.get_weights())
+
+    def _build_memory(self, hyperparameters):
+        # With checkpointing enabled the replay buffer is memory-mapped inside the checkpoint directory
+        checkpoint = hyperparameters.get("checkpoint", {})
+        storage_dir = None
+        resume = False
+        if checkpoint.get("enabled", False) and checkpoint.get("memmap_replay", True):
+            storage_dir = os.path.join(checkpoint.get("directory", "checkpoints"), "replay")
+            resume = checkpoint.get("resume", True)
+
+        prioritized = hyperparameters.get("prioritized_replay", {})
+        self.prioritized_replay = prioritized.get("enabled", False)
+        if not self.prioritized_replay:
+            return ReplayBuffer(hyperparameters["memory_size"], self.state_size,
+                                storage_dir=storage_dir, resume=resume)
+        return PrioritizedReplayBuffer(
+            hyperparameters["memory_size"],
+            self.state_size,
+            alpha=prioritized.get("alpha", 0.6),
+            beta_start=prioritized.get("beta_start", 0.4),
+            beta_steps=prioritized.get("beta_steps", 100000),
+            epsilon=prioritized.get("epsilon", 1e-6),
+            storage_dir=storage_dir,
+            resume=resume,
+        )
+
     def _build_model(self):
+        # Keras is imported here so importing this module does not load TensorFlow
+        from keras.models import Sequential
+        from keras.layers import Dense
+        from keras.optimizers import Adam
+
         model = Sequential()
         model.add(Dense(24, input_dim=self.state_size, activation='relu'))
         model.add(Dense(24, activation='relu'))
@@ -24,15 +65,19 @@ class DQNAgent:
         model.compile(loss='mse', optimizer=Adam(learning_rate=self.learning_rate))
         return model
 
+    def update_target_model(self):
+        # Copy weights from model to target_model
+        self.target_model.set_weights(self.model.get_weights())
+
     def select_action(self, state):
         if np.random.rand() <= self.epsilon:
             return np.random.choice(self.action_size)
-        state = np.reshape(state, [1, self.state_size])
-        q_values = self.model.predict(state, verbose=0)
+        q_values = self.policy.predict(state)
         return np.argmax(q_values[0])
 
-    def store_experience(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done))
+    def store_experience(self, state, action, reward, next_state, done, horizon=1):
+        # horizon > 1 marks an n-step transition whose reward is already a discounted sum
+        self.memory.add(state, action, reward, next_state, done, horizon)
         # Decay epsilon
         if self.epsilon > self.final_epsilon:
             self.epsilon -= self.epsilon_decay
@@ -42,28 +87,60 @@ class DQNAgent:
         self.train(self.batch_size)
 
     def train(self, batch_size):
-        import random
-        import numpy as np
-        
         if len(self.memory) < batch_size:
             return
             
-        minibatch = random.sample(self.memory, batch_size)
-        states = np.zeros((batch_size, self.state_size))
-        targets = np.zeros((batch_size, self.action_size))
-        
-        for i, (state, action, reward, next_state, done) in enumerate(minibatch):
-            state = np.reshape(state, [1, self.state_size])
-            next_state = np.reshape(next_state, [1, self.state_size])
-            
-            target = reward
-            if not done:
-                target += self.discount_factor * np.amax(self.model.predict(next_state, verbose=0)[0])
-                
-            target_f = self.model.predict(state, verbose=0)
-            target_f[0][action] = target
-            
-            states[i] = state
-            targets[i] = target_f
-            
-        self.model.fit(states, targets, epochs=1, verbose=0, batch_size=batch_size)
\ No newline at end of file
+        if self.prioritized_replay:
+            states, actions, rewards, next_states, dones, horizons, indices, weights = self.memory.sample(batch_size)
+        else:
+            states, actions, rewards, next_states, dones, horizons = self.memory.sample(batch_size)
+            weights = None
+
+        # One forward pass for the whole batch on each network
+        targets = self.model.predict_on_batch(states)
+        next_q_values = self.target_model.predict_on_batch(next_states)
+
+        # Bellman update for the taken actions only; terminal transitions do not bootstrap
+        rows = np.arange(batch_size)
+        bootstrap = self.discount_factor ** horizons * (1.0 - dones)
+        bellman_targets = rewards + bootstrap * np.amax(next_q_values, axis=1)
+        td_errors = bellman_targets - targets[rows, actions]
+        targets[rows, actions] = bellman_targets
+
+        # Importance-sampling weights correct the bias from prioritized sampling
+        self.model.train_on_batch(states, targets, sample_weight=weights)
+
+        if self.prioritized_replay:
+            self.memory.update_priorities(indices, td_errors)
+
+        # Keep the NumPy policy in sync with the freshly trained weights
+        self.policy.set_weights(self.model.get_weights())
+
+        self.train_steps += 1
+        if self.train_steps % self.target_update_frequency == 0:
+            self.update_target_model()
+
+    def _checkpoint(self):
+        import tensorflow as tf
+        return tf.train.Checkpoint(model=self.model, target_model=self.target_model, optimizer=self.model.optimizer)
+
+    def save_checkpoint(self, directory):
+        # Model, target model and optimizer slots via tf.train.Checkpoint; counters as JSON
+        os.makedirs(directory, exist_ok=True)
+        self._checkpoint().write(os.path.join(directory, "model"))
+        with open(os.path.join(directory, "agent_state.json"), 'w') as f:
+            json.dump({"epsilon": self.epsilon, "train_steps": self.train_steps}, f)
+        self.memory.flush()
+
+    def load_checkpoint(self, directory):
+        # Optimizer slots are created lazily, so their restore is deferred until the first update
+        self._checkpoint().read(os.path.join(directory, "model")).expect_partial()
+        with open(os.path.join(directory, "agent_state.json"), 'r') as f:
+            state = json.load(f)
+        self.epsilon = state["epsilon"]
+        self.train_steps = state["train_steps"]
+        self.policy.set_weights(self.model.get_weights())
+
+    def save_policy(self, filepath):
+        # Saves the weights as .npz so evaluation can run without TensorFlow
+        self.policy.save(filepath)
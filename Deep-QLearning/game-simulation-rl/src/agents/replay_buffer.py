@@ -0,0 +1,241 @@
+import json
+import os
+
+import numpy as np
+
+
+class ReplayBuffer:
+    def __init__(self, capacity, state_size, storage_dir=None, resume=False):
+        self.capacity = capacity
+        self.state_size = state_size
+
+        # Columns live in memory-mapped .npy files when storage_dir is given
+        self.storage_dir = storage_dir
+        self.resume = resume
+        if storage_dir is not None:
+            os.makedirs(storage_dir, exist_ok=True)
+
+        # Preallocated storage, one column per transition field
+        self.states = self._allocate("states", (capacity, state_size), np.float32)
+        self.actions = self._allocate("actions", (capacity,), np.int64)
+        self.rewards = self._allocate("rewards", (capacity,), np.float32)
+        self.next_states = self._allocate("next_states", (capacity, state_size), np.float32)
+        self.dones = self._allocate("dones", (capacity,), np.float32)
+        # Number of env steps each transition spans; bootstrapping discounts by gamma ** horizon
+        self.horizons = self._allocate("horizons", (capacity,), np.int64, fill=1)
+
+        # Next slot to write and number of valid entries
+        self.position = 0
+        self.size = 0
+        if self.resume:
+            self._load_metadata()
+
+    def _allocate(self, name, shape, dtype, fill=0):
+        if self.storage_dir is None:
+            return np.full(shape, fill, dtype=dtype)
+
+        # Reopen an existing file in place so resuming does not copy the data
+        path = os.path.join(self.storage_dir, f"{name}.npy")
+        if self.resume and os.path.exists(path):
+            column = np.load(path, mmap_mode='r+')
+            if column.shape == shape and column.dtype == dtype:
+                return column
+            self.resume = False
+        column = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+        if fill:
+            column[:] = fill
+        return column
+
+    def _metadata(self):
+        return {"position": self.position, "size": self.size}
+
+    def _load_metadata(self):
+        path = os.path.join(self.storage_dir, "metadata.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            metadata = json.load(f)
+        self.position = metadata["position"]
+        self.size = metadata["size"]
+        return metadata
+
+    def flush(self):
+        # Persist memory-mapped columns and the write position
+        if self.storage_dir is None:
+            return
+        for column in (self.states, self.actions, self.rewards, self.next_states, self.dones, self.horizons):
+            column.flush()
+        path = os.path.join(self.storage_dir, "metadata.json")
+        with open(path + ".tmp", 'w') as f:
+            json.dump(self._metadata(), f)
+        os.replace(path + ".tmp", path)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state, action, reward, next_state, done, horizon=1):
+        # Overwrite the oldest entry once the buffer is full
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.horizons[i] = horizon
+
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def add_batch(self, states, actions, rewards, next_states, dones, horizons=1):
+        # Write a batch of transitions, wrapping around the end of the buffer
+        count = len(actions)
+        horizons = np.broadcast_to(horizons, (count,))
+        if count > self.capacity:
+            # Only the newest transitions would survive anyway
+            states, actions, rewards = states[-self.capacity:], actions[-self.capacity:], rewards[-self.capacity:]
+            next_states, dones = next_states[-self.capacity:], dones[-self.capacity:]
+            horizons = horizons[-self.capacity:]
+            count = self.capacity
+
+        indices = (self.position + np.arange(count)) % self.capacity
+        self.states[indices] = states
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_states[indices] = next_states
+        self.dones[indices] = dones
+        self.horizons[indices] = horizons
+
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+    def sample(self, batch_size):
+        # Uniform sampling; each column is gathered into one contiguous array
+        indices = np.random.randint(0, self.size, size=batch_size)
+        return self._gather(indices)
+
+    def _gather(self, indices):
+        return (
+            self.states[indices],
+            self.actions[indices],
+            self.rewards[indices],
+            self.next_states[indices],
+            self.dones[indices],
+            self.horizons[indices],
+        )
+
+
+class SumTree:
+    def __init__(self, capacity):
+        # Complete binary tree stored in an array, root at index 1 and leaves at the end
+        self.tree_capacity = 1
+        while self.tree_capacity < capacity:
+            self.tree_capacity *= 2
+        self.depth = self.tree_capacity.bit_length() - 1
+        self.tree = np.zeros(2 * self.tree_capacity, dtype=np.float64)
+
+    def total(self):
+        return self.tree[1]
+
+    def get(self, indices):
+        return self.tree[indices + self.tree_capacity]
+
+    def update(self, indices, priorities):
+        # Set the leaves, then recompute each ancestor level once for the whole batch
+        nodes = np.asarray(indices) + self.tree_capacity
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        # Walk down from the root for every value at once, O(log n) per value
+        nodes = np.ones(len(values), dtype=np.int64)
+        values = np.array(values, dtype=np.float64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sums = self.tree[left]
+            go_right = values > left_sums
+            values -= np.where(go_right, left_sums, 0.0)
+            nodes = left + go_right
+        return nodes - self.tree_capacity
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    def __init__(self, capacity, state_size, alpha=0.6, beta_start=0.4, beta_steps=100000, epsilon=1e-6,
+                 storage_dir=None, resume=False):
+        self.alpha = alpha
+        self.beta_start = beta_start
+        self.beta_steps = beta_steps
+        self.epsilon = epsilon
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+        self.sample_calls = 0
+        super().__init__(capacity, state_size, storage_dir=storage_dir, resume=resume)
+
+    def _metadata(self):
+        metadata = super()._metadata()
+        metadata["max_priority"] = self.max_priority
+        metadata["sample_calls"] = self.sample_calls
+        return metadata
+
+    def _load_metadata(self):
+        metadata = super()._load_metadata()
+        if metadata is None:
+            return None
+        # Priorities are only trusted when this buffer type wrote them alongside the metadata
+        path = os.path.join(self.storage_dir, "priorities.npy")
+        priorities = np.load(path) if "max_priority" in metadata and os.path.exists(path) else None
+        if priorities is not None and priorities.shape == self.tree.tree.shape:
+            self.max_priority = metadata["max_priority"]
+            self.sample_calls = metadata["sample_calls"]
+            self.tree.tree[:] = priorities
+        else:
+            # Resuming a plain ReplayBuffer: every stored transition starts at the default priority
+            self.max_priority = 1.0
+            self.sample_calls = 0
+            if self.size:
+                self.tree.update(np.arange(self.size), self.max_priority ** self.alpha)
+        return metadata
+
+    def flush(self):
+        if self.storage_dir is not None:
+            # The tree is small next to the transitions, so it is saved whole
+            np.save(os.path.join(self.storage_dir, "priorities.npy"), self.tree.tree)
+        super().flush()
+
+    def add(self, state, action, reward, next_state, done, horizon=1):
+        # New transitions get the highest priority seen so far so they are replayed at least once
+        index = self.position
+        super().add(state, action, reward, next_state, done, horizon)
+        self.tree.update([index], self.max_priority ** self.alpha)
+
+    def add_batch(self, states, actions, rewards, next_states, dones, horizons=1):
+        count = min(len(actions), self.capacity)
+        indices = (self.position + np.arange(count)) % self.capacity
+        super().add_batch(states, actions, rewards, next_states, dones, horizons)
+        self.tree.update(indices, self.max_priority ** self.alpha)
+
+    def beta(self):
+        # Importance-sampling exponent, annealed linearly towards 1
+        fraction = min(1.0, self.sample_calls / self.beta_steps)
+        return self.beta_start + fraction * (1.0 - self.beta_start)
+
+    def sample(self, batch_size):
+        # Stratified sampling: one value from each equal slice of the total priority
+        total = self.tree.total()
+        segment = total / batch_size
+        values = (np.arange(batch_size) + np.random.uniform(size=batch_size)) * segment
+        indices = np.minimum(self.tree.find(np.minimum(values, total)), self.size - 1)
+
+        # Importance-sampling weights, normalized so the largest weight is 1
+        probabilities = self.tree.get(indices) / total
+        weights = (self.size * probabilities) ** -self.beta()
+        weights = (weights / weights.max()).astype(np.float32)
+        self.sample_calls += 1
+
+        return self._gather(indices) + (indices, weights)
+
+    def update_priorities(self, indices, td_errors):
+        priorities = np.abs(td_errors) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
@@ -0,0 +1,165 @@
+import hashlib
+import os
+
+import numpy as np
+
+
+def state_index(state, grid_size):
+    # Recover the player cell from the normalized observation
+    x = int(round(state[0] * grid_size))
+    y = int(round(state[1] * grid_size))
+    return x * grid_size + y
+
+
+def _layout_key(env):
+    layout = f"{env.grid_size}|{env.goal_pos}|{env.action_size}|".encode() + np.packbits(env.occupancy).tobytes()
+    return hashlib.sha1(layout).hexdigest()[:16]
+
+
+def build_transition_tables(env, cache_dir=None):
+    # Tables indexed [state, action] with state = x * grid_size + y,
+    # filled by running env.step() from every cell so they follow its rules exactly
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, f"transitions_{_layout_key(env)}.npz")
+        if os.path.exists(path):
+            with np.load(path) as tables:
+                return tables["next_states"], tables["rewards"], tables["dones"]
+
+    num_states = env.grid_size * env.grid_size
+    next_states = np.zeros((num_states, env.action_size), dtype=np.int64)
+    rewards = np.zeros((num_states, env.action_size))
+    dones = np.zeros((num_states, env.action_size), dtype=bool)
+
+    for x in range(env.grid_size):
+        for y in range(env.grid_size):
+            s = x * env.grid_size + y
+            for action in range(env.action_size):
+                env.player_pos = [x, y]
+                next_state, reward, done, _ = env.step(action)
+                next_states[s, action] = state_index(next_state, env.grid_size)
+                rewards[s, action] = reward
+                dones[s, action] = done
+    env.reset()
+
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez(path, next_states=next_states, rewards=rewards, dones=dones)
+    return next_states, rewards, dones
+
+
+def value_iteration(next_states, rewards, dones, discount_factor, tolerance=1e-8, max_iterations=10000):
+    # Synchronous Bellman optimality backups over the whole table
+    values = np.zeros(next_states.shape[0])
+    bootstrap = discount_factor * ~dones
+    for _ in range(max_iterations):
+        q_values = rewards + bootstrap * values[next_states]
+        new_values = q_values.max(axis=1)
+        if np.max(np.abs(new_values - values)) < tolerance:
+            values = new_values
+            break
+        values = new_values
+    return rewards + bootstrap * values[next_states], values
+
+
+def policy_values(next_states, rewards, dones, discount_factor, actions, tolerance=1e-8, max_iterations=10000):
+    # Exact-enough evaluation of a deterministic policy given one action per state
+    rows = np.arange(next_states.shape[0])
+    policy_next = next_states[rows, actions]
+    policy_rewards = rewards[rows, actions]
+    bootstrap = discount_factor * ~dones[rows, actions]
+    values = np.zeros(next_states.shape[0])
+    for _ in range(max_iterations):
+        new_values = policy_rewards + bootstrap * values[policy_next]
+        if np.max(np.abs(new_values - values)) < tolerance:
+            return new_values
+        values = new_values
+    return values
+
+
+class TabularSolver:
+    def __init__(self, env, discount_factor, cache_dir=None):
+        self.env = env
+        self.grid_size = env.grid_size
+        self.discount_factor = discount_factor
+        self.next_states, self.rewards, self.dones = build_transition_tables(env, cache_dir)
+        self.q_values, self.values = value_iteration(self.next_states, self.rewards, self.dones, discount_factor)
+
+    def all_states(self):
+        # Normalized observations for every cell, in table order
+        cells = np.arange(self.grid_size * self.grid_size)
+        states = np.zeros((len(cells), self.env.state_size))
+        states[:, 0] = cells // self.grid_size / self.grid_size
+        states[:, 1] = cells % self.grid_size / self.grid_size
+        states[:, 2] = self.env.goal_pos[0] / self.grid_size
+        states[:, 3] = self.env.goal_pos[1] / self.grid_size
+        return states
+
+    def optimal_action(self, state):
+        return int(np.argmax(self.q_values[state_index(state, self.grid_size)]))
+
+    def score(self, q_function, start_state=None):
+        # Compare the greedy policy of q_function (e.g. NumpyQNetwork.predict) against the optimum
+        actions = np.argmax(q_function(self.all_states()), axis=1)
+        rows = np.arange(len(actions))
+        optimal = self.q_values[rows, actions] >= self.values - 1e-6
+
+        if start_state is None:
+            start_state = self.env.reset()
+        start = state_index(start_state, self.grid_size)
+        achieved = policy_values(self.next_states, self.rewards, self.dones, self.discount_factor, actions)
+        return {
+            "optimal_action_fraction": float(optimal.mean()),
+            "start_value": float(achieved[start]),
+            "optimal_start_value": float(self.values[start]),
+            "value_gap": float(self.values[start] - achieved[start]),
+        }
+
+
+class TabularQAgent:
+    def __init__(self, env, hyperparameters, q_values=None, learn_online=None):
+        self.grid_size = env.grid_size
+        self.state_size = env.state_size
+        self.action_size = env.action_size
+        self.learning_rate = hyperparameters.get("tabular_learning_rate", 0.1)
+        self.discount_factor = hyperparameters["discount_factor"]
+        self.epsilon = hyperparameters["exploration_strategy"]["initial_epsilon"]
+        self.final_epsilon = hyperparameters["exploration_strategy"]["final_epsilon"]
+        self.epsilon_decay = (self.epsilon - self.final_epsilon) / hyperparameters["exploration_strategy"]["decay_steps"]
+
+        # Start from a solved table to act as a fixed baseline, or from zeros to learn online.
+        # A frozen table is never updated and only explores at final_epsilon
+        self.learn_online = q_values is None if learn_online is None else learn_online
+        if q_values is None:
+            q_values = np.zeros((self.grid_size * self.grid_size, self.action_size))
+        self.q_values = np.array(q_values, dtype=np.float64)
+        if not self.learn_online:
+            self.epsilon = self.final_epsilon
+
+    def select_action(self, state):
+        if np.random.rand() <= self.epsilon:
+            return np.random.choice(self.action_size)
+        return int(np.argmax(self.q_values[state_index(state, self.grid_size)]))
+
+    def store_experience(self, state, action, reward, next_state, done, horizon=1):
+        # Tabular Q-learning updates immediately, so there is no replay memory
+        if not self.learn_online:
+            return
+        s = state_index(state, self.grid_size)
+        target = reward
+        if not done:
+            target += self.discount_factor ** horizon * np.max(self.q_values[state_index(next_state, self.grid_size)])
+        self.q_values[s, action] += self.learning_rate * (target - self.q_values[s, action])
+
+        # Decay epsilon
+        if self.epsilon > self.final_epsilon:
+            self.epsilon -= self.epsilon_decay
+
+    def learn(self):
+        pass
+
+    def predict(self, states):
+        # Same shape as NumpyQNetwork.predict so it can be scored and evaluated the same way
+        states = np.atleast_2d(states)
+        x = np.rint(states[:, 0] * self.grid_size).astype(np.int64)
+        y = np.rint(states[:, 1] * self.grid_size).astype(np.int64)
+        return self.q_values[x * self.grid_size + y]
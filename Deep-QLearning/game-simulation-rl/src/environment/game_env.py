@@ -1,21 +1,54 @@
 import numpy as np
 
+# Obstacles used when no procedural density is configured
+DEFAULT_OBSTACLES = [[5, 5], [4, 6], [6, 4]]
+
+def build_occupancy(grid_size, obstacle_density=None, seed=None, start_pos=(0, 0), goal_pos=None):
+    # Boolean bitmap indexed [x, y]; True marks an obstacle
+    if goal_pos is None:
+        goal_pos = (grid_size - 1, grid_size - 1)
+
+    if obstacle_density is None:
+        occupancy = np.zeros((grid_size, grid_size), dtype=bool)
+        for x, y in DEFAULT_OBSTACLES:
+            if x < grid_size and y < grid_size:
+                occupancy[x, y] = True
+    else:
+        rng = np.random.default_rng(seed)
+        occupancy = rng.random((grid_size, grid_size)) < obstacle_density
+
+    # Start and goal cells are always free
+    occupancy[start_pos[0], start_pos[1]] = False
+    occupancy[goal_pos[0], goal_pos[1]] = False
+    return occupancy
+
 class GameEnvironment:
-    def __init__(self):
+    def __init__(self, grid_size=10, obstacle_density=None, seed=None, render_window=40):
         # Define state and action space dimensions
         self.state_size = 4
         self.action_size = 5
-        
+
         # Game parameters
-        self.grid_size = 10
+        self.grid_size = grid_size
         self.player_pos = [0, 0]
-        self.goal_pos = [9, 9]
-        self.obstacle_pos = [[5, 5], [4, 6], [6, 4]]
-        
+        self.goal_pos = [grid_size - 1, grid_size - 1]
+        self.obstacle_density = obstacle_density
+        self.render_window = render_window
+        self.generate_obstacles(seed)
+
         # Initialize state
         self.state = self.reset()
 
-    def reset(self):
+    def generate_obstacles(self, seed=None):
+        # Occupancy bitmap makes collision checks O(1) regardless of obstacle count
+        self.occupancy = build_occupancy(self.grid_size, self.obstacle_density, seed, goal_pos=self.goal_pos)
+        self.obstacle_pos = np.argwhere(self.occupancy).tolist()
+
+    def reset(self, seed=None):
+        # A seed draws a new procedural layout; without one the current layout is kept
+        if seed is not None and self.obstacle_density is not None:
+            self.generate_obstacles(seed)
+
         # Reset player position
         self.player_pos = [0, 0]
         self.state = self._get_state()
@@ -32,16 +65,16 @@ class GameEnvironment:
             self.player_pos[1] = max(0, self.player_pos[1] - 1)
         elif action == 4:
             self.player_pos[1] = min(self.grid_size - 1, self.player_pos[1] + 1)
-        
+
         # Update state
         self.state = self._get_state()
-        
+
         # Check if goal is reached
         goal_reached = self.player_pos == self.goal_pos
-        
+
         # Check collision with obstacles
-        collision = any(self.player_pos == obstacle for obstacle in self.obstacle_pos)
-        
+        collision = self.occupancy[self.player_pos[0], self.player_pos[1]]
+
         # Calculate reward and done flag
         if goal_reached:
             reward = 10
@@ -53,10 +86,10 @@ class GameEnvironment:
             # Small negative reward for each step
             reward = -0.1
             done = False
-        
+
         # Add info dictionary (required for standard gym interface)
         info = {}
-        
+
         return self.state, reward, done, info
 
     def render(self):
@@ -69,23 +102,24 @@ class GameEnvironment:
         norm_player_y = self.player_pos[1] / self.grid_size
         norm_goal_x = self.goal_pos[0] / self.grid_size
         norm_goal_y = self.goal_pos[1] / self.grid_size
-        
+
         return np.array([norm_player_x, norm_player_y, norm_goal_x, norm_goal_y])
 
     def display_state(self, state):
-        print("\n" + "-" * (self.grid_size + 2))
-        for y in range(self.grid_size):
-            row = "|"
-            for x in range(self.grid_size):
-                if [x, y] == self.player_pos:
-                    row += "P"
-                elif [x, y] == self.goal_pos:
-                    row += "G"
-                elif any([x, y] == obstacle for obstacle in self.obstacle_pos):
-                    row += "X"
-                else:
-                    row += " "
-            row += "|"
-            print(row)
-        print("-" * (self.grid_size + 2))
-        print(f"Player position: {self.player_pos}")
\ No newline at end of file
+        # Large grids are shown as a window centred on the player
+        size = min(self.grid_size, self.render_window)
+        x0 = min(max(0, self.player_pos[0] - size // 2), self.grid_size - size)
+        y0 = min(max(0, self.player_pos[1] - size // 2), self.grid_size - size)
+
+        # Build the view with array ops instead of a per-cell obstacle scan
+        view = np.where(self.occupancy[x0:x0 + size, y0:y0 + size], "X", " ")
+        for (x, y), mark in ((self.goal_pos, "G"), (self.player_pos, "P")):
+            if x0 <= x < x0 + size and y0 <= y < y0 + size:
+                view[x - x0, y - y0] = mark
+
+        # Rows are y, columns are x
+        rows = ["|" + "".join(row) + "|" for row in view.T]
+        print("\n" + "-" * (size + 2))
+        print("\n".join(rows))
+        print("-" * (size + 2))
+        print(f"Player position: {self.player_pos}")
@@ -1,3 +1,8 @@
+import numpy as np
+
+# Movement deltas (dx, dy) indexed by action, matching define_action_space()
+ACTION_DELTAS = np.array([[0, 0], [-1, 0], [1, 0], [0, -1], [0, 1]], dtype=np.int64)
+
 def normalize_state(state):
     # Normalize the state to a range of [0, 1]
     return state / 255.0
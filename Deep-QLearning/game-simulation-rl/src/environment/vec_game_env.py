@@ -0,0 +1,64 @@
+import numpy as np
+from src.environment.game_env import build_occupancy
+from src.environment.utils import ACTION_DELTAS
+
+
+class VecGameEnvironment:
+    def __init__(self, num_envs, grid_size=10, obstacle_density=None, seed=None):
+        # Define state and action space dimensions
+        self.num_envs = num_envs
+        self.state_size = 4
+        self.action_size = 5
+
+        # Game parameters (same rules as GameEnvironment)
+        self.grid_size = grid_size
+        self.start_pos = np.array([0, 0], dtype=np.int64)
+        self.goal_pos = np.array([grid_size - 1, grid_size - 1], dtype=np.int64)
+
+        # Occupancy grid so collision checks are a single gather for the whole batch
+        self.obstacle_grid = build_occupancy(grid_size, obstacle_density, seed)
+        self.obstacle_pos = np.argwhere(self.obstacle_grid)
+
+        # Per-instance state, one row per environment
+        self.player_pos = np.zeros((num_envs, 2), dtype=np.int64)
+        self.states = np.zeros((num_envs, self.state_size))
+        self.states[:, 2:] = self.goal_pos / self.grid_size
+
+        self.reset()
+
+    def reset(self):
+        # Reset every instance to the start position
+        self.player_pos[:] = self.start_pos
+        self._update_states()
+        return self.states.copy()
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.int64)
+
+        # Move every player at once, clamped to the grid
+        self.player_pos += ACTION_DELTAS[actions]
+        np.clip(self.player_pos, 0, self.grid_size - 1, out=self.player_pos)
+        self._update_states()
+
+        # Check goal and collision for the whole batch
+        goal_reached = np.all(self.player_pos == self.goal_pos, axis=1)
+        collision = self.obstacle_grid[self.player_pos[:, 0], self.player_pos[:, 1]] & ~goal_reached
+
+        # Calculate rewards and done flags
+        rewards = np.full(self.num_envs, -0.1)
+        rewards[goal_reached] = 10
+        rewards[collision] = -5
+        dones = goal_reached | collision
+
+        # Auto-reset finished instances; their final states are kept in info
+        info = {}
+        if dones.any():
+            info["terminal_states"] = self.states[dones].copy()
+            self.player_pos[dones] = self.start_pos
+            self._update_states()
+
+        return self.states.copy(), rewards, dones, info
+
+    def _update_states(self):
+        # Normalize positions to [0,1] for the neural network
+        self.states[:, :2] = self.player_pos / self.grid_size
@@ -0,0 +1,25 @@
+class ActionRepeat:
+    def __init__(self, environment, repeat):
+        # Repeats each chosen action `repeat` times, so the agent decides once per `repeat` env steps
+        self.environment = environment
+        self.repeat = repeat
+
+    def __getattr__(self, name):
+        # Everything else (state_size, action_size, render, grid_size, ...) comes from the wrapped env
+        return getattr(self.environment, name)
+
+    def reset(self, *args, **kwargs):
+        return self.environment.reset(*args, **kwargs)
+
+    def step(self, action, repeat=None):
+        # repeat caps this call below self.repeat, e.g. to stop exactly at an episode step limit
+        total_reward = 0
+        for repeat in range(self.repeat if repeat is None else repeat):
+            state, reward, done, info = self.environment.step(action)
+            total_reward += reward
+            # Stop early so the episode never continues past a terminal step
+            if done:
+                break
+        info = dict(info)
+        info["repeats"] = repeat + 1
+        return state, total_reward, done, info
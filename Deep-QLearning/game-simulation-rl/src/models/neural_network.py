@@ -1,6 +1,12 @@
+import numpy as np
+
 class NeuralNetwork:
-    def __init__(self, input_shape, output_shape, learning_rate=0.001):
+    def __init__(self, input_shape, output_shape, learning_rate=0.001, compiled=True):
         self.model = self.build_model(input_shape, output_shape, learning_rate)
+        # compiled=True routes forward/train through graph-compiled step functions
+        self.compiled = compiled
+        if self.compiled:
+            self.build_step_functions()
 
     def build_model(self, input_shape, output_shape, learning_rate):
         from tensorflow.keras.models import Sequential
@@ -15,15 +21,59 @@ class NeuralNetwork:
         model.compile(loss='mse', optimizer=Adam(learning_rate=learning_rate))
         return model
 
+    def build_step_functions(self):
+        import tensorflow as tf
+
+        # Batch dimension is left open so changing batch sizes never retraces
+        input_dim = self.model.input_shape[-1]
+        output_dim = self.model.output_shape[-1]
+        states_spec = tf.TensorSpec([None, input_dim], tf.float32)
+        targets_spec = tf.TensorSpec([None, output_dim], tf.float32)
+        weights_spec = tf.TensorSpec([None], tf.float32)
+
+        # The model's own optimizer is reused, so its slots persist across calls and saves
+        model = self.model
+        optimizer = self.model.optimizer
+        loss_fn = tf.keras.losses.MeanSquaredError()
+
+        @tf.function(input_signature=[states_spec])
+        def infer(states):
+            return model(states, training=False)
+
+        @tf.function(input_signature=[states_spec, targets_spec, weights_spec])
+        def train_step(states, targets, sample_weight):
+            with tf.GradientTape() as tape:
+                loss = loss_fn(targets, model(states, training=True), sample_weight=sample_weight)
+            gradients = tape.gradient(loss, model.trainable_variables)
+            optimizer.apply_gradients(zip(gradients, model.trainable_variables))
+            return loss
+
+        self._infer = infer
+        self._train_step = train_step
+
     def forward(self, state):
-        return self.model.predict(state)
+        if not self.compiled:
+            return self.model.predict(state)
+        states = np.asarray(state, dtype=np.float32).reshape(-1, self.model.input_shape[-1])
+        return self._infer(states).numpy()
 
-    def train(self, states, targets):
-        self.model.fit(states, targets, epochs=1, verbose=0)
+    def train(self, states, targets, sample_weight=None):
+        # One gradient step over the whole batch; returns the loss before the step
+        if not self.compiled:
+            history = self.model.fit(states, targets, batch_size=len(states), epochs=1, verbose=0,
+                                     sample_weight=sample_weight)
+            return float(history.history["loss"][-1])
+        states = np.asarray(states, dtype=np.float32)
+        if sample_weight is None:
+            sample_weight = np.ones(len(states), dtype=np.float32)
+        loss = self._train_step(states, np.asarray(targets, dtype=np.float32), np.asarray(sample_weight, dtype=np.float32))
+        return float(loss)
 
     def save(self, filepath):
         self.model.save(filepath)
 
     def load(self, filepath):
         from tensorflow.keras.models import load_model
-        self.model = load_model(filepath)
\ No newline at end of file
+        self.model = load_model(filepath)
+        if self.compiled:
+            self.build_step_functions()
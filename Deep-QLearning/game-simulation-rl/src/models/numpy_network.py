@@ -0,0 +1,36 @@
+import numpy as np
+
+
+class NumpyQNetwork:
+    def __init__(self, weights=None):
+        self.layers = []
+        if weights is not None:
+            self.set_weights(weights)
+
+    def set_weights(self, weights):
+        # Keras get_weights() order: kernel, bias for each Dense layer
+        self.layers = [
+            (np.array(weights[i], dtype=np.float32), np.array(weights[i + 1], dtype=np.float32))
+            for i in range(0, len(weights), 2)
+        ]
+
+    def get_weights(self):
+        weights = []
+        for kernel, bias in self.layers:
+            weights.extend([kernel, bias])
+        return weights
+
+    def predict(self, states):
+        # ReLU hidden layers and a linear output layer, matching the Keras model
+        x = np.atleast_2d(np.asarray(states, dtype=np.float32))
+        for kernel, bias in self.layers[:-1]:
+            x = np.maximum(x @ kernel + bias, 0.0)
+        kernel, bias = self.layers[-1]
+        return x @ kernel + bias
+
+    def save(self, filepath):
+        np.savez(filepath, *self.get_weights())
+
+    def load(self, filepath):
+        with np.load(filepath) as data:
+            self.set_weights([data[f"arr_{i}"] for i in range(len(data.files))])
@@ -0,0 +1,268 @@
+import multiprocessing as mp
+import queue
+from collections import deque
+
+import numpy as np
+
+from src.models.numpy_network import NumpyQNetwork
+from src.training.schedule import TrainSchedule
+from src.training.n_step import NStepAccumulator
+from src.environment.wrappers import ActionRepeat
+
+
+def _shared_view(raw_array, dtype, shape):
+    # NumPy view over a shared-memory block, no copy
+    return np.frombuffer(raw_array, dtype=dtype).reshape(shape)
+
+
+def _unflatten_weights(flat, shapes):
+    weights = []
+    offset = 0
+    for shape in shapes:
+        size = int(np.prod(shape))
+        weights.append(flat[offset:offset + size].reshape(shape).copy())
+        offset += size
+    return weights
+
+
+def _actor_loop(actor_id, env_factory, hyperparameters, shared, weight_shapes, free_slots, full_slots, stop_event):
+    np.random.seed(hyperparameters["distributed"].get("seed", 0) + actor_id)
+    environment = env_factory()
+    # Same action_repeat handling as Trainer: episode limits and the schedule count env steps
+    action_repeat = hyperparameters.get("action_repeat", 1)
+    if action_repeat > 1:
+        environment = ActionRepeat(environment, action_repeat)
+    state_size = environment.state_size
+    action_size = environment.action_size
+
+    num_slots = shared["num_slots"]
+    chunk_size = shared["chunk_size"]
+    states = _shared_view(shared["states"], np.float32, (num_slots, chunk_size, state_size))
+    actions = _shared_view(shared["actions"], np.int32, (num_slots, chunk_size))
+    rewards = _shared_view(shared["rewards"], np.float32, (num_slots, chunk_size))
+    next_states = _shared_view(shared["next_states"], np.float32, (num_slots, chunk_size, state_size))
+    dones = _shared_view(shared["dones"], np.float32, (num_slots, chunk_size))
+    horizons = _shared_view(shared["horizons"], np.int32, (num_slots, chunk_size))
+    flat_weights = _shared_view(shared["weights"], np.float32, (-1,))
+
+    # n_step > 1 turns this actor's 1-step transitions into discounted n-step ones before they
+    # reach the shared slots; pending holds transitions that did not fit in the current slot
+    n_step = hyperparameters.get("n_step", 1)
+    n_step_buffer = NStepAccumulator(n_step, hyperparameters["discount_factor"]) if n_step > 1 else None
+    pending = deque()
+
+    # Local policy copy, refreshed from the learner's published weights
+    policy = NumpyQNetwork()
+    policy_version = -1
+    refresh_steps = hyperparameters["distributed"].get("policy_refresh_steps", 400)
+
+    # Same linear epsilon schedule as DQNAgent, counted in this actor's steps
+    exploration = hyperparameters["exploration_strategy"]
+    epsilon = exploration["initial_epsilon"]
+    final_epsilon = exploration["final_epsilon"]
+    epsilon_decay = (epsilon - final_epsilon) / exploration["decay_steps"]
+    max_steps = hyperparameters["max_steps_per_episode"]
+
+    state = environment.reset()
+    episode_reward = 0
+    episode_steps = 0
+    finished_episodes = []
+    slot = None
+    count = 0
+    total_steps = 0
+    chunk_env_steps = 0
+
+    while not stop_event.is_set():
+        if slot is None:
+            try:
+                slot = free_slots.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            count = 0
+
+        # Copy pending transitions straight into this actor's shared slot
+        while pending and count < chunk_size:
+            (states[slot, count], actions[slot, count], rewards[slot, count],
+             next_states[slot, count], dones[slot, count], horizons[slot, count]) = pending.popleft()
+            count += 1
+
+        if count == chunk_size:
+            full_slots.put((actor_id, slot, count, chunk_env_steps, finished_episodes, epsilon))
+            finished_episodes = []
+            chunk_env_steps = 0
+            slot = None
+            continue
+
+        if total_steps % refresh_steps == 0 and shared["version"].value != policy_version:
+            with shared["version"].get_lock():
+                policy_version = shared["version"].value
+                policy.set_weights(_unflatten_weights(flat_weights, weight_shapes))
+
+        # Epsilon-greedy action from the local policy copy
+        if np.random.rand() <= epsilon:
+            action = np.random.choice(action_size)
+        else:
+            action = np.argmax(policy.predict(state)[0])
+        if epsilon > final_epsilon:
+            epsilon -= epsilon_decay
+
+        if action_repeat > 1:
+            repeat = min(action_repeat, max_steps - episode_steps)
+            next_state, reward, done, info = environment.step(action, repeat=repeat)
+        else:
+            next_state, reward, done, info = environment.step(action)
+        repeats = info.get("repeats", 1)
+        total_steps += 1
+        chunk_env_steps += repeats
+
+        if n_step_buffer is None:
+            pending.append((state, action, reward, next_state, done, 1))
+        else:
+            pending.extend(n_step_buffer.push(state, action, reward, next_state, done))
+
+        state = next_state
+        episode_reward += reward
+        episode_steps += repeats
+        if done or episode_steps >= max_steps:
+            # A truncated episode still has pending n-step transitions
+            if n_step_buffer is not None:
+                pending.extend(n_step_buffer.flush())
+            finished_episodes.append((episode_reward, episode_steps))
+            state = environment.reset()
+            episode_reward = 0
+            episode_steps = 0
+
+
+class DistributedTrainer:
+    def __init__(self, env_factory, agent, hyperparameters):
+        self.env_factory = env_factory
+        self.agent = agent
+        self.hyperparameters = hyperparameters
+        self.num_episodes = hyperparameters["num_episodes"]
+        self.max_steps = hyperparameters["max_steps_per_episode"]
+
+        distributed = hyperparameters["distributed"]
+        self.num_actors = distributed.get("num_actors", mp.cpu_count() - 1) or 1
+        self.chunk_size = distributed.get("chunk_size", 64)
+        self.num_slots = distributed.get("num_slots", 4)
+        self.performance_log = []
+        self.schedule = TrainSchedule(hyperparameters)
+
+        # Spawn keeps actors free of the learner's TensorFlow state
+        self.context = mp.get_context("spawn")
+
+    def _allocate_shared(self):
+        state_size = self.agent.state_size
+        slots = self.num_actors * self.num_slots * self.chunk_size
+        weights = self.agent.policy.get_weights()
+        self.weight_shapes = [w.shape for w in weights]
+
+        self.shared = {
+            "num_slots": self.num_actors * self.num_slots,
+            "chunk_size": self.chunk_size,
+            "states": self.context.RawArray("f", slots * state_size),
+            "actions": self.context.RawArray("i", slots),
+            "rewards": self.context.RawArray("f", slots),
+            "next_states": self.context.RawArray("f", slots * state_size),
+            "dones": self.context.RawArray("f", slots),
+            "horizons": self.context.RawArray("i", slots),
+            "weights": self.context.RawArray("f", sum(w.size for w in weights)),
+            "version": self.context.Value("i", 0),
+        }
+
+        total_slots = self.shared["num_slots"]
+        self.states = _shared_view(self.shared["states"], np.float32, (total_slots, self.chunk_size, state_size))
+        self.actions = _shared_view(self.shared["actions"], np.int32, (total_slots, self.chunk_size))
+        self.rewards = _shared_view(self.shared["rewards"], np.float32, (total_slots, self.chunk_size))
+        self.next_states = _shared_view(self.shared["next_states"], np.float32, (total_slots, self.chunk_size, state_size))
+        self.dones = _shared_view(self.shared["dones"], np.float32, (total_slots, self.chunk_size))
+        self.horizons = _shared_view(self.shared["horizons"], np.int32, (total_slots, self.chunk_size))
+        self.flat_weights = _shared_view(self.shared["weights"], np.float32, (-1,))
+
+    def publish_weights(self):
+        # Copy the learner's current weights into shared memory and bump the version
+        flat = np.concatenate([w.ravel() for w in self.agent.policy.get_weights()])
+        with self.shared["version"].get_lock():
+            self.flat_weights[:] = flat
+            self.shared["version"].value += 1
+
+    def _start_actors(self):
+        self.stop_event = self.context.Event()
+        self.full_slots = self.context.Queue()
+        self.free_slots = []
+        self.actors = []
+        for actor_id in range(self.num_actors):
+            # Each actor owns a fixed range of slots in the shared block
+            free_slots = self.context.Queue()
+            for slot in range(actor_id * self.num_slots, (actor_id + 1) * self.num_slots):
+                free_slots.put(slot)
+            self.free_slots.append(free_slots)
+
+            actor = self.context.Process(
+                target=_actor_loop,
+                args=(actor_id, self.env_factory, self.hyperparameters, self.shared,
+                      self.weight_shapes, free_slots, self.full_slots, self.stop_event),
+                daemon=True,
+            )
+            actor.start()
+            self.actors.append(actor)
+
+    def _stop_actors(self):
+        self.stop_event.set()
+        for actor in self.actors:
+            actor.join(timeout=5)
+            if actor.is_alive():
+                actor.terminate()
+
+    def _next_chunk(self, poll_interval=1.0):
+        # Wait for a filled slot, failing instead of hanging if every actor has exited
+        while True:
+            try:
+                return self.full_slots.get(timeout=poll_interval)
+            except queue.Empty:
+                if not any(actor.is_alive() for actor in self.actors):
+                    exit_codes = [actor.exitcode for actor in self.actors]
+                    raise RuntimeError(f"All actor processes exited (exit codes {exit_codes})")
+
+    def train(self):
+        self._allocate_shared()
+        self.publish_weights()
+        self._start_actors()
+
+        try:
+            while len(self.performance_log) < self.num_episodes:
+                actor_id, slot, count, env_steps, finished_episodes, epsilon = self._next_chunk()
+
+                # Move the chunk into replay memory and hand the slot back to its actor
+                self.agent.memory.add_batch(
+                    self.states[slot, :count],
+                    self.actions[slot, :count],
+                    self.rewards[slot, :count],
+                    self.next_states[slot, :count],
+                    self.dones[slot, :count],
+                    self.horizons[slot, :count],
+                )
+                self.free_slots[actor_id].put(slot)
+                self.agent.epsilon = epsilon
+
+                # Same update schedule as the single-process trainer, counted over all actors' steps
+                for _ in range(self.schedule.step(env_steps)):
+                    self.agent.learn()
+                self.publish_weights()
+
+                for total_reward, steps in finished_episodes:
+                    if len(self.performance_log) >= self.num_episodes:
+                        break
+                    self.performance_log.append(total_reward)
+                    print(f"Episode {len(self.performance_log)}/{self.num_episodes}, " +
+                          f"Actor: {actor_id}, " +
+                          f"Steps: {steps}/{self.max_steps}, " +
+                          f"Total Reward: {total_reward:.2f}, " +
+                          f"Epsilon: {epsilon:.4f}")
+        finally:
+            self._stop_actors()
+
+    def save_performance(self, filename):
+        with open(filename, 'w') as f:
+            for reward in self.performance_log:
+                f.write(f"{reward}\n")
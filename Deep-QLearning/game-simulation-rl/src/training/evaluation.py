@@ -0,0 +1,97 @@
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.environment.game_env import GameEnvironment
+from src.models.numpy_network import NumpyQNetwork
+
+
+def load_policy_weights(filepath):
+    # .npz files come from DQNAgent.save_policy; anything else is treated as a saved Keras model
+    if filepath.endswith(".npz"):
+        policy = NumpyQNetwork()
+        policy.load(filepath)
+        return policy.get_weights()
+
+    from tensorflow.keras.models import load_model
+    return load_model(filepath).get_weights()
+
+
+def run_episode(env, policy, max_steps, epsilon=0.0, rng=None, seed=None):
+    # One episode with a NumPy policy, random actions when policy is None.
+    # Returns (total_reward, steps, reached_goal)
+    rng = rng if rng is not None else np.random.default_rng()
+    state = env.reset(seed=seed)
+    total_reward = 0
+    reward = 0
+    done = False
+    for step in range(max_steps):
+        if policy is None or rng.random() < epsilon:
+            action = int(rng.integers(env.action_size))
+        else:
+            action = int(np.argmax(policy.predict(state)[0]))
+        state, reward, done, _ = env.step(action)
+        total_reward += reward
+        if done:
+            break
+    return total_reward, step + 1, bool(done and reward > 0)
+
+
+def _evaluate_episodes(weights, env_config, seeds, max_steps, epsilon, randomize_layouts):
+    # Worker body: TensorFlow-free, deterministic given the episode seeds
+    env = GameEnvironment(**env_config)
+    policy = NumpyQNetwork(weights) if weights is not None else None
+    results = np.zeros((len(seeds), 3))
+    for i, seed in enumerate(seeds):
+        rng = np.random.default_rng(seed)
+        layout_seed = int(seed) if randomize_layouts else None
+        results[i] = run_episode(env, policy, max_steps, epsilon, rng, seed=layout_seed)
+    return results
+
+
+def summarize_episodes(results):
+    rewards, steps, successes = results[:, 0], results[:, 1], results[:, 2]
+    return {
+        "episodes": len(results),
+        "success_rate": float(successes.mean()),
+        "mean_steps": float(steps.mean()),
+        "mean_steps_success": float(steps[successes > 0].mean()) if successes.any() else None,
+        "mean_reward": float(rewards.mean()),
+        "std_reward": float(rewards.std()),
+        "reward_percentiles": {str(p): float(np.percentile(rewards, p)) for p in (5, 25, 50, 75, 95)},
+    }
+
+
+def evaluate_policy(weights, env_config=None, episodes=1000, max_steps=200, epsilon=0.0, seed=0, workers=None,
+                    randomize_layouts=False):
+    # Per-episode seeds come from one SeedSequence, so results do not depend on the worker count.
+    # randomize_layouts draws a new procedural obstacle layout from each episode seed
+    env_config = dict(env_config or {})
+    sequence = np.random.SeedSequence(seed)
+    seeds = sequence.generate_state(episodes)
+
+    # A procedural layout without a fixed seed is drawn from the same SeedSequence,
+    # so every worker, and every run with this seed, evaluates the same grid
+    if env_config.get("obstacle_density") is not None and env_config.get("seed") is None:
+        env_config["seed"] = int(sequence.spawn(1)[0].generate_state(1)[0])
+    workers = min(workers or os.cpu_count(), episodes)
+
+    start = time.perf_counter()
+    if workers <= 1:
+        results = _evaluate_episodes(weights, env_config, seeds, max_steps, epsilon, randomize_layouts)
+    else:
+        chunks = np.array_split(seeds, workers)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+            futures = [pool.submit(_evaluate_episodes, weights, env_config, chunk, max_steps, epsilon,
+                                   randomize_layouts)
+                       for chunk in chunks]
+            results = np.concatenate([future.result() for future in futures])
+    elapsed = time.perf_counter() - start
+
+    summary = summarize_episodes(results)
+    summary["wall_time"] = elapsed
+    summary["env_steps_per_sec"] = float(results[:, 1].sum() / elapsed)
+    return summary
@@ -0,0 +1,40 @@
+from collections import deque
+
+
+class NStepAccumulator:
+    def __init__(self, n_step, discount_factor):
+        # Rolling window of the last n_step 1-step transitions of one environment
+        self.n_step = n_step
+        self.discount_factor = discount_factor
+        self.window = deque()
+
+    def _emit(self, next_state, done):
+        # Oldest transition in the window with the discounted sum of the rewards after it
+        state, action, _, _, _ = self.window[0]
+        discounted_return = 0.0
+        for k, (_, _, reward, _, _) in enumerate(self.window):
+            discounted_return += self.discount_factor ** k * reward
+        transition = (state, action, discounted_return, next_state, done, len(self.window))
+        self.window.popleft()
+        return transition
+
+    def push(self, state, action, reward, next_state, done):
+        # Returns the (state, action, reward, next_state, done, horizon) transitions that became complete
+        self.window.append((state, action, reward, next_state, done))
+        if done:
+            # The episode ended: every pending transition now has its full return
+            return self.flush()
+        if len(self.window) == self.n_step:
+            return [self._emit(next_state, False)]
+        return []
+
+    def flush(self):
+        # Emit everything pending, e.g. when an episode is truncated at max_steps;
+        # shorter windows keep their own horizon so they bootstrap with the right discount
+        if not self.window:
+            return []
+        _, _, _, next_state, done = self.window[-1]
+        transitions = []
+        while self.window:
+            transitions.append(self._emit(next_state, done))
+        return transitions
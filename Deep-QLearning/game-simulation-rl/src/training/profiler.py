@@ -0,0 +1,63 @@
+import csv
+import json
+import time
+from contextlib import nullcontext
+
+# Shared no-op context returned when profiling is disabled
+_NULL_PHASE = nullcontext()
+
+
+class _Phase:
+    def __init__(self, totals, name):
+        self.totals = totals
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.totals[self.name] = self.totals.get(self.name, 0.0) + time.perf_counter() - self.start
+
+
+class PhaseTimer:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.records = []
+        self.totals = {}
+        self.episode_start = 0.0
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self.totals, name)
+
+    def start_episode(self):
+        if self.enabled:
+            self.totals = {}
+            self.episode_start = time.perf_counter()
+
+    def end_episode(self, episode, env_steps, updates):
+        if not self.enabled:
+            return
+        wall_time = time.perf_counter() - self.episode_start
+        record = {"episode": episode, "wall_time": wall_time, "env_steps": env_steps, "updates": updates}
+        for name, seconds in self.totals.items():
+            record[f"{name}_time"] = seconds
+        record["env_steps_per_sec"] = env_steps / wall_time if wall_time > 0 else 0.0
+        record["updates_per_sec"] = updates / wall_time if wall_time > 0 else 0.0
+        self.records.append(record)
+
+    def save(self, filename):
+        # JSON for .json files, CSV otherwise
+        if filename.endswith(".json"):
+            with open(filename, 'w') as f:
+                json.dump(self.records, f)
+            return
+
+        fieldnames = []
+        for record in self.records:
+            fieldnames.extend(key for key in record if key not in fieldnames)
+        with open(filename, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(self.records)
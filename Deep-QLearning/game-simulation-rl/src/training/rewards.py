@@ -1,3 +1,11 @@
+import numpy as np
+from src.environment.utils import ACTION_DELTAS
+
+# Reward values used by GameEnvironment.step
+GOAL_REWARD = 10
+COLLISION_PENALTY = -5
+STEP_PENALTY = -0.1
+
 def calculate_reward(state, action, next_state):
     # Example reward calculation based on the game state and action taken
     if next_state['goal_reached']:
@@ -7,14 +15,55 @@ def calculate_reward(state, action, next_state):
     else:
         return -1  # Small penalty for each step taken
 
-def get_reward_for_action(state, action):
-    # This function can be expanded to include more complex reward logic
-    next_state = simulate_action(state, action)  # Simulate the action to get the next state
-    return calculate_reward(state, action, next_state)
-
-def simulate_action(state, action):
-    # Placeholder for simulating the action and returning the next state
-    # This should be replaced with actual logic to update the state based on the action
-    next_state = state.copy()
-    # Update next_state based on action
-    return next_state
\ No newline at end of file
+def states_to_positions(states, grid_size):
+    # Undo the [0,1] normalization of GameEnvironment observations
+    states = np.atleast_2d(states)
+    return np.rint(states[:, :2] * grid_size).astype(np.int64), np.rint(states[:, 2:4] * grid_size).astype(np.int64)
+
+def simulate_actions(states, actions, grid_size):
+    # Apply a batch of actions to a batch of observations with GameEnvironment's movement rules
+    positions, _ = states_to_positions(states, grid_size)
+    positions = np.clip(positions + ACTION_DELTAS[np.asarray(actions)], 0, grid_size - 1)
+    next_states = np.array(np.atleast_2d(states), dtype=np.float64)
+    next_states[:, :2] = positions / grid_size
+    return next_states
+
+def calculate_rewards(states, actions, next_states, occupancy, grid_size,
+                      goal_reward=GOAL_REWARD, collision_penalty=COLLISION_PENALTY, step_penalty=STEP_PENALTY):
+    # Reward and done vectors for a batch of (state, action, next_state);
+    # states and actions are accepted so shaped rewards can depend on them
+    positions, goals = states_to_positions(next_states, grid_size)
+    goal_reached = np.all(positions == goals, axis=1)
+    collision = occupancy[positions[:, 0], positions[:, 1]] & ~goal_reached
+
+    rewards = np.full(len(positions), step_penalty, dtype=np.float64)
+    rewards[collision] = collision_penalty
+    rewards[goal_reached] = goal_reward
+    return rewards, goal_reached | collision
+
+def get_reward_for_action(state, action, occupancy, grid_size):
+    # Single-transition wrapper around the batched functions
+    next_state = simulate_action(state, action, grid_size)
+    rewards, _ = calculate_rewards(state, [action], next_state, occupancy, grid_size)
+    return rewards[0]
+
+def simulate_action(state, action, grid_size):
+    return simulate_actions(state, [action], grid_size)
+
+def relabel_rewards(memory, reward_fn, chunk_size=65536):
+    # Recompute rewards and done flags for everything in a ReplayBuffer in place.
+    # reward_fn(states, actions, next_states) -> (rewards, dones), e.g. a partial of calculate_rewards.
+    # Only 1-step transitions can be relabeled: n-step rows hold discounted returns whose
+    # intermediate states are not stored
+    if np.any(memory.horizons[:len(memory)] > 1):
+        raise ValueError("relabel_rewards needs 1-step transitions; the buffer holds n-step returns (n_step > 1)")
+
+    for start in range(0, len(memory), chunk_size):
+        end = min(start + chunk_size, len(memory))
+        rewards, dones = reward_fn(memory.states[start:end], memory.actions[start:end], memory.next_states[start:end])
+        memory.rewards[start:end] = rewards
+        memory.dones[start:end] = dones
+
+    # TD-error priorities refer to the old rewards; reset them so every row is replayed again
+    if hasattr(memory, "update_priorities") and len(memory):
+        memory.tree.update(np.arange(len(memory)), memory.max_priority ** memory.alpha)
@@ -0,0 +1,20 @@
+class TrainSchedule:
+    def __init__(self, hyperparameters):
+        # learning_starts: env steps collected before the first update
+        # train_every: env steps between updates
+        # gradient_steps: learn calls per update
+        self.learning_starts = hyperparameters.get("learning_starts", 0)
+        self.train_every = hyperparameters.get("train_every", 1)
+        self.gradient_steps = hyperparameters.get("gradient_steps", 1)
+        self.env_steps = 0
+
+    def step(self, count=1):
+        # Advance by count env steps and return how many learn calls are due.
+        # Env step t (1-indexed) triggers an update when t >= learning_starts and t % train_every == 0.
+        previous = self.env_steps
+        self.env_steps += count
+        first = max(previous, self.learning_starts - 1)
+        if self.env_steps <= first:
+            return 0
+        updates = self.env_steps // self.train_every - first // self.train_every
+        return updates * self.gradient_steps
@@ -1,30 +1,95 @@
+import json
+import os
+
 import numpy as np
+from src.training.schedule import TrainSchedule
+from src.training.profiler import PhaseTimer
+from src.training.n_step import NStepAccumulator
+from src.training.trajectory import TrajectoryWriter
+from src.environment.wrappers import ActionRepeat
 
 class Trainer:
     def __init__(self, environment, agent, hyperparameters):
         self.agent = agent
+        # action_repeat > 1 makes each agent decision cover several env steps. max_steps_per_episode
+        # and the TrainSchedule still count env steps; n-step returns and the bootstrap discount
+        # are per decision, with each decision's summed reward undiscounted
+        self.action_repeat = hyperparameters.get("action_repeat", 1)
+        if self.action_repeat > 1:
+            environment = ActionRepeat(environment, self.action_repeat)
         self.environment = environment
         self.num_episodes = hyperparameters["num_episodes"]
         self.max_steps = hyperparameters["max_steps_per_episode"]
         self.render = hyperparameters["render"]
+        self.verbose = hyperparameters.get("verbose", True)
         self.performance_log = []
+        self.schedule = TrainSchedule(hyperparameters)
+
+        # n_step > 1 stores discounted n-step transitions instead of raw 1-step ones
+        self.n_step = hyperparameters.get("n_step", 1)
+        self.n_step_buffer = NStepAccumulator(self.n_step, hyperparameters["discount_factor"]) if self.n_step > 1 else None
+
+        # Per-phase timing; phase() is a shared no-op context when disabled
+        self.timer = PhaseTimer(hyperparameters.get("profiling", {}).get("enabled", False))
+        self.timing_log = self.timer.records
+        self.episode_updates = 0
+
+        # Optional on-disk recording of every raw transition for offline training
+        recording = hyperparameters.get("trajectory_recording", {})
+        self.recorder = None
+        if recording.get("enabled", False):
+            self.recorder = TrajectoryWriter(recording.get("directory", "trajectories"),
+                                             environment.state_size, recording.get("chunk_size", 65536))
+
+        # Periodic checkpoints of the agent and training progress
+        checkpoint = hyperparameters.get("checkpoint", {})
+        self.checkpoint_enabled = checkpoint.get("enabled", False)
+        self.checkpoint_dir = checkpoint.get("directory", "checkpoints")
+        self.checkpoint_interval = checkpoint.get("interval_episodes", 25)
+        self.start_episode = 0
+        if self.checkpoint_enabled and checkpoint.get("resume", True) and \
+                os.path.exists(os.path.join(self.checkpoint_dir, "trainer_state.json")):
+            self.load_checkpoint()
 
     def run_episode(self):
         state = self.environment.reset()
         total_reward = 0
+        self.episode_updates = 0
+        timer = self.timer
+        env_steps = 0
+        step = 0
 
-        for step in range(self.max_steps):
+        while env_steps < self.max_steps:
             # Select an action
-            action = self.agent.select_action(state)
+            with timer.phase("select_action"):
+                action = self.agent.select_action(state)
             
             # Take action and observe the next state and reward
-            next_state, reward, done, _ = self.environment.step(action)
+            with timer.phase("env_step"):
+                if self.action_repeat > 1:
+                    repeat = min(self.action_repeat, self.max_steps - env_steps)
+                    next_state, reward, done, info = self.environment.step(action, repeat=repeat)
+                else:
+                    next_state, reward, done, info = self.environment.step(action)
+            repeats = info.get("repeats", 1)
+            env_steps += repeats
             
             # Store the experience in agent's memory
-            self.agent.store_experience(state, action, reward, next_state, done)
+            with timer.phase("store_experience"):
+                if self.recorder is not None:
+                    self.recorder.add(state, action, reward, next_state, done)
+                if self.n_step_buffer is None:
+                    self.agent.store_experience(state, action, reward, next_state, done)
+                else:
+                    for transition in self.n_step_buffer.push(state, action, reward, next_state, done):
+                        self.agent.store_experience(*transition)
             
-            # Learn from experience
-            self.agent.learn()
+            # Learn from experience when the schedule says an update is due
+            with timer.phase("learn"):
+                updates = self.schedule.step(repeats)
+                for _ in range(updates):
+                    self.agent.learn()
+            self.episode_updates += updates
             
             # Update state and accumulate reward
             state = next_state
@@ -32,24 +97,71 @@ class Trainer:
             
             # Render if enabled
             if self.render and step % 10 == 0:
-                self.environment.render()
+                with timer.phase("render"):
+                    self.environment.render()
+            step += 1
 
             if done:
                 break
 
-        return total_reward, step + 1
+        # A truncated episode still has pending n-step transitions
+        if self.n_step_buffer is not None:
+            for transition in self.n_step_buffer.flush():
+                self.agent.store_experience(*transition)
+
+        return total_reward, env_steps
 
-    def train(self):
-        for episode in range(self.num_episodes):
+    def train(self, episode_callback=None):
+        # episode_callback(episode, total_reward, steps) may return True to stop training early
+        for episode in range(self.start_episode, self.num_episodes):
+            self.timer.start_episode()
             total_reward, steps = self.run_episode()
+            self.timer.end_episode(episode + 1, steps, self.episode_updates)
             self.performance_log.append(total_reward)
             
-            print(f"Episode {episode+1}/{self.num_episodes}, " +
-                  f"Steps: {steps}/{self.max_steps}, " +
-                  f"Total Reward: {total_reward:.2f}, " +
-                  f"Epsilon: {self.agent.epsilon:.4f}")
+            if self.verbose:
+                print(f"Episode {episode+1}/{self.num_episodes}, " +
+                      f"Steps: {steps}/{self.max_steps}, " +
+                      f"Total Reward: {total_reward:.2f}, " +
+                      f"Epsilon: {self.agent.epsilon:.4f}")
+
+            if self.checkpoint_enabled and (episode + 1) % self.checkpoint_interval == 0:
+                self.save_checkpoint(episode + 1)
+
+            if episode_callback is not None and episode_callback(episode + 1, total_reward, steps):
+                break
+
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def save_checkpoint(self, episode):
+        self.agent.save_checkpoint(self.checkpoint_dir)
+
+        # Trainer state is written last, so it only ever points at a complete checkpoint
+        state = {
+            "episode": episode,
+            "env_steps": self.schedule.env_steps,
+            "performance_log": self.performance_log,
+        }
+        path = os.path.join(self.checkpoint_dir, "trainer_state.json")
+        with open(path + ".tmp", 'w') as f:
+            json.dump(state, f)
+        os.replace(path + ".tmp", path)
+
+    def load_checkpoint(self):
+        with open(os.path.join(self.checkpoint_dir, "trainer_state.json"), 'r') as f:
+            state = json.load(f)
+        self.agent.load_checkpoint(self.checkpoint_dir)
+        self.start_episode = state["episode"]
+        self.schedule.env_steps = state["env_steps"]
+        self.performance_log = state["performance_log"]
+        print(f"Resumed from checkpoint at episode {self.start_episode}")
 
     def save_performance(self, filename):
         with open(filename, 'w') as f:
             for reward in self.performance_log:
-                f.write(f"{reward}\n")
\ No newline at end of file
+                f.write(f"{reward}\n")
+
+    def save_timings(self, filename):
+        # Per-episode phase timings, as CSV or JSON depending on the extension
+        self.timer.save(filename)
\ No newline at end of file
@@ -0,0 +1,76 @@
+import glob
+import os
+
+import numpy as np
+
+
+class TrajectoryWriter:
+    def __init__(self, directory, state_size, chunk_size=65536):
+        # Transitions are buffered column by column and written as one .npz file per full chunk,
+        # so memory use is bounded by chunk_size whatever the length of the run
+        self.directory = directory
+        self.chunk_size = chunk_size
+        os.makedirs(directory, exist_ok=True)
+        self.chunk_index = len(glob.glob(os.path.join(directory, "chunk_*.npz")))
+
+        self.states = np.zeros((chunk_size, state_size), dtype=np.float32)
+        self.actions = np.zeros(chunk_size, dtype=np.int8)
+        self.rewards = np.zeros(chunk_size, dtype=np.float32)
+        self.next_states = np.zeros((chunk_size, state_size), dtype=np.float32)
+        self.dones = np.zeros(chunk_size, dtype=np.bool_)
+        self.count = 0
+
+    def add(self, state, action, reward, next_state, done):
+        i = self.count
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.count += 1
+        if self.count == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.count == 0:
+            return
+        n = self.count
+        path = os.path.join(self.directory, f"chunk_{self.chunk_index:06d}.npz")
+        # Written under a temporary name so readers never see a partial chunk
+        with open(path + ".tmp", 'wb') as f:
+            np.savez(f, states=self.states[:n], actions=self.actions[:n], rewards=self.rewards[:n],
+                     next_states=self.next_states[:n], dones=self.dones[:n])
+        os.replace(path + ".tmp", path)
+        self.chunk_index += 1
+        self.count = 0
+
+    def close(self):
+        self.flush()
+
+
+def iter_trajectory_chunks(directory):
+    # Yields one dict of column arrays per chunk, in recording order
+    for path in sorted(glob.glob(os.path.join(directory, "chunk_*.npz"))):
+        with np.load(path) as chunk:
+            yield {name: chunk[name] for name in chunk.files}
+
+
+def load_into_replay(memory, directory):
+    # Feeds recorded chunks straight into a ReplayBuffer; returns the number of transitions read
+    total = 0
+    for chunk in iter_trajectory_chunks(directory):
+        memory.add_batch(chunk["states"], chunk["actions"], chunk["rewards"],
+                         chunk["next_states"], chunk["dones"])
+        total += len(chunk["actions"])
+    return total
+
+
+def train_offline(agent, directory, num_updates, log_every=1000):
+    # Train an agent purely from recorded trajectories, without stepping an environment
+    transitions = load_into_replay(agent.memory, directory)
+    print(f"Loaded {transitions} transitions from {directory}")
+    for update in range(1, num_updates + 1):
+        agent.learn()
+        if update % log_every == 0:
+            print(f"Offline update {update}/{num_updates}")
+    return transitions
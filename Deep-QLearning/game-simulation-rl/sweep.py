@@ -0,0 +1,169 @@
+import argparse
+import copy
+import csv
+import itertools
+import json
+import multiprocessing as mp
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from main import load_hyperparameters, validate_hyperparameters
+
+
+def set_nested(hyperparameters, dotted_key, value):
+    # "exploration_strategy.decay_steps" -> hyperparameters["exploration_strategy"]["decay_steps"]
+    keys = dotted_key.split(".")
+    target = hyperparameters
+    for key in keys[:-1]:
+        target = target.setdefault(key, {})
+    target[keys[-1]] = value
+
+
+def sample_value(space, rng):
+    # A list is a set of choices; a {"min", "max"} object is a range, optionally log-scaled or integer
+    if isinstance(space, list):
+        return rng.choice(space)
+    low, high = space["min"], space["max"]
+    if space.get("log", False):
+        value = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+    else:
+        value = rng.uniform(low, high)
+    return int(round(value)) if space.get("int", False) else value
+
+
+def generate_trials(spec):
+    parameters = spec["parameters"]
+    if spec.get("method", "grid") == "grid":
+        # Grid search only accepts lists of choices
+        for key, space in parameters.items():
+            if not isinstance(space, list):
+                raise ValueError(f"grid search needs a list of choices for {key!r}, got {space!r}; "
+                                 f"use \"method\": \"random\" for ranges")
+        keys = list(parameters)
+        return [dict(zip(keys, values)) for values in itertools.product(*(parameters[k] for k in keys))]
+
+    rng = random.Random(spec.get("seed", 0))
+    return [{key: sample_value(space, rng) for key, space in parameters.items()}
+            for _ in range(spec["num_trials"])]
+
+
+def _init_worker():
+    # One TensorFlow thread per worker so trials do not oversubscribe the cores
+    os.environ["TF_NUM_INTRAOP_THREADS"] = "1"
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+    os.environ["OMP_NUM_THREADS"] = "1"
+    os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def run_trial(trial_id, hyperparameters, early_stopping, output_dir):
+    from src.agents.dqn_agent import DQNAgent
+    from src.environment.game_env import GameEnvironment
+    from src.training.trainer import Trainer
+
+    np.random.seed(trial_id)
+    env = GameEnvironment(**hyperparameters.get("environment", {}))
+    agent = DQNAgent(state_size=env.state_size, action_size=env.action_size, hyperparameters=hyperparameters)
+    trainer = Trainer(env, agent, hyperparameters)
+
+    min_episodes = early_stopping.get("min_episodes", 0)
+    window = early_stopping.get("window", 50)
+    min_mean_reward = early_stopping.get("min_mean_reward")
+    stopped_early = []
+
+    def stop_hopeless(episode, total_reward, steps):
+        # Give up on trials whose recent mean reward is still below the threshold
+        if min_mean_reward is None or episode < max(min_episodes, window):
+            return False
+        if np.mean(trainer.performance_log[-window:]) < min_mean_reward:
+            stopped_early.append(episode)
+            return True
+        return False
+
+    start = time.perf_counter()
+    trainer.train(episode_callback=stop_hopeless)
+    wall_time = time.perf_counter() - start
+
+    rewards = np.asarray(trainer.performance_log)
+    window = min(window, len(rewards))
+    rolling_means = np.convolve(rewards, np.ones(window) / window, mode="valid")
+    trainer.save_performance(os.path.join(output_dir, f"trial_{trial_id:03d}_rewards.txt"))
+    trainer.save_timings(os.path.join(output_dir, f"trial_{trial_id:03d}_timings.csv"))
+    env_steps = trainer.schedule.env_steps
+    return {
+        "trial": trial_id,
+        "episodes": len(rewards),
+        "stopped_early": bool(stopped_early),
+        "final_mean_reward": float(np.mean(rewards[-window:])),
+        "best_mean_reward": float(rolling_means.max()),
+        "wall_time": wall_time,
+        "env_steps": env_steps,
+        "env_steps_per_sec": env_steps / wall_time if wall_time > 0 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hyperparameter sweep over config/hyperparameters.json.")
+    parser.add_argument("--spec", default="config/sweep.json")
+    parser.add_argument("--config", default="config/hyperparameters.json")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with open(args.spec, 'r') as f:
+        spec = json.load(f)
+    base = load_hyperparameters(args.config)
+    output_dir = spec.get("output_dir", "sweeps")
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Trials run single-process, quietly, with per-episode timings recorded
+    base.update(spec.get("overrides", {}))
+    base["verbose"] = False
+    base["distributed"] = {"enabled": False}
+    base["checkpoint"] = {"enabled": False}
+    base["profiling"] = {"enabled": True}
+
+    trials = []
+    for trial_id, params in enumerate(generate_trials(spec)):
+        hyperparameters = copy.deepcopy(base)
+        for key, value in params.items():
+            set_nested(hyperparameters, key, value)
+        errors = validate_hyperparameters(hyperparameters)
+        if errors:
+            print(f"Skipping trial {trial_id}: " + "; ".join(errors))
+            continue
+        trials.append((trial_id, params, hyperparameters))
+
+    workers = args.workers or spec.get("workers") or os.cpu_count()
+    results_path = os.path.join(output_dir, "results.csv")
+    fieldnames = ["trial", *spec["parameters"], "episodes", "stopped_early", "final_mean_reward",
+                  "best_mean_reward", "wall_time", "env_steps", "env_steps_per_sec"]
+    print(f"Running {len(trials)} trials on {workers} workers, results in {results_path}")
+
+    with open(results_path, 'w', newline='') as f, ProcessPoolExecutor(
+            max_workers=workers, mp_context=mp.get_context("spawn"), initializer=_init_worker) as pool:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        futures = {
+            pool.submit(run_trial, trial_id, hyperparameters, spec.get("early_stopping", {}), output_dir): params
+            for trial_id, params, hyperparameters in trials
+        }
+
+        # Rows are written as trials finish so partial sweeps are still usable
+        for future in as_completed(futures):
+            result = future.result()
+            writer.writerow({**futures[future], **result})
+            f.flush()
+            print(f"Trial {result['trial']}: " +
+                  f"Episodes: {result['episodes']}{' (stopped early)' if result['stopped_early'] else ''}, " +
+                  f"Final mean reward: {result['final_mean_reward']:.2f}, " +
+                  f"Wall time: {result['wall_time']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
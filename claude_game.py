@@ -6,6 +6,7 @@ import random
 import matplotlib.pyplot as plt
 import time
 import os
+import threading
 import pygame  # Add pygame for better visualization
 
 # Constants for visualization
@@ -19,19 +20,43 @@ BACKGROUND_COLOR = (0, 0, 0)
 
 # Define the Snake game environment
 class SnakeGameEnv:
-    def __init__(self, grid_size=10):
+    def __init__(self, grid_size=10, observation_mode="copy"):
         self.grid_size = grid_size
+        # Persistent observation, updated in place as the snake moves.
+        # observation_mode "copy" returns a fresh flat array per step, "view" a read-only
+        # view of the buffer that is overwritten by the next step
+        if observation_mode not in ("copy", "view"):
+            raise ValueError("observation_mode must be 'copy' or 'view'")
+        self.observation_mode = observation_mode
+        self.observation = np.zeros((grid_size, grid_size, 3), dtype=np.float32)
+        self._flat_observation = self.observation.reshape(-1).view()
+        self._flat_observation.flags.writeable = False
         self.reset()
         self.render_mode = None  # 'human', 'pygame', or None
         self.pygame_initialized = False
         self.screen = None
 
-    def reset(self):
+    def reset(self, out=None):
+        # Occupancy grid of snake cells plus an index of free cells, kept in sync
+        # so collision checks and food placement do not scan the snake
+        num_cells = self.grid_size * self.grid_size
+        self.occupied = np.zeros((self.grid_size, self.grid_size), dtype=bool)
+        self.free_cells = np.arange(num_cells)  # First free_count entries are the free cells
+        self.free_index = np.arange(num_cells)  # Position of each cell in free_cells
+        self.free_count = num_cells
+
         # Initialize the snake at the center of the grid
         self.snake = deque([(self.grid_size // 2, self.grid_size // 2)])
         self.head = self.snake[0]
+        self._occupy(self.head)
+
+        # Clear the observation and paint the initial head (body and head channels)
+        self.observation.fill(0.0)
+        self.observation[self.head + (0,)] = 1.0
+        self.observation[self.head + (1,)] = 1.0
 
         # Place food at a random empty position
+        self.food = None
         self.place_food()
 
         # Initialize direction to right
@@ -44,21 +69,53 @@ class SnakeGameEnv:
         self.done = False
 
         # Return initial state
-        return self._get_state()
+        return self._get_state(out)
+
+    def _occupy(self, cell):
+        # Mark a cell as snake and swap it out of the free-cell index in O(1)
+        i, j = cell
+        self.occupied[i, j] = True
+        index = i * self.grid_size + j
+        position = self.free_index[index]
+        self.free_count -= 1
+        last = self.free_cells[self.free_count]
+        self.free_cells[position] = last
+        self.free_index[last] = position
+        self.free_cells[self.free_count] = index
+        self.free_index[index] = self.free_count
+
+    def _vacate(self, cell):
+        # Return a cell to the free-cell index in O(1)
+        i, j = cell
+        self.occupied[i, j] = False
+        index = i * self.grid_size + j
+        position = self.free_index[index]
+        first_occupied = self.free_cells[self.free_count]
+        self.free_cells[position] = first_occupied
+        self.free_index[first_occupied] = position
+        self.free_cells[self.free_count] = index
+        self.free_index[index] = self.free_count
+        self.free_count += 1
+
+    def _in_bounds(self, cell):
+        return 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size
 
     def place_food(self):
-        empty_cells = [
-            (i, j)
-            for i in range(self.grid_size)
-            for j in range(self.grid_size)
-            if (i, j) not in self.snake
-        ]
-        if empty_cells:
-            self.food = random.choice(empty_cells)
+        if self.free_count > 0:
+            index = int(self.free_cells[random.randrange(self.free_count)])
+            self._set_food(divmod(index, self.grid_size))
         else:
-            self.food = None  # No empty space left
+            self._set_food(None)  # No empty space left
 
-    def step(self, action):
+    def _set_food(self, cell):
+        # Move the food mark in the observation buffer
+        if self.food:
+            self.observation[self.food + (2,)] = 0.0
+        self.food = cell
+        if cell:
+            self.observation[cell + (2,)] = 1.0
+
+    def step(self, action, out=None):
         # Define the movement directions: up, right, down, left
         directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
 
@@ -78,28 +135,38 @@ class SnakeGameEnv:
         # Move snake
         head_i, head_j = self.head
         new_head = (head_i + self.direction[0], head_j + self.direction[1])
+        if self._in_bounds(self.head):
+            self.observation[self.head + (1,)] = 0.0
         self.head = new_head
         self.snake.appendleft(new_head)
 
         # Check if food eaten
         reward = 0
-        if self.head == self.food:
+        ate_food = self.head == self.food
+        if ate_food:
             self.score += 1
             reward = 10.0  # Reward for eating food
-            self.place_food()
         else:
-            self.snake.pop()  # Remove tail if food not eaten
+            tail = self.snake.pop()  # Remove tail if food not eaten
+            if self._in_bounds(tail):
+                self._vacate(tail)
+                self.observation[tail + (0,)] = 0.0
+
+        # Check if game is over (collision with boundaries or itself);
+        # the head is not marked yet, so an occupied cell means the body
+        in_bounds = self._in_bounds(self.head)
+        collision = not in_bounds or self.occupied[self.head]
+        if in_bounds:
+            # The head is painted even on a self-collision, as part of the final observation
+            self.observation[self.head + (0,)] = 1.0
+            self.observation[self.head + (1,)] = 1.0
+            if not collision:
+                self._occupy(self.head)
+        if ate_food:
+            self.place_food()
 
-        # Check if game is over (collision with boundaries or itself)
         head_i, head_j = self.head
-        if (
-            head_i < 0
-            or head_i >= self.grid_size
-            or head_j < 0
-            or head_j >= self.grid_size
-            or (self.head in list(self.snake)[1:])
-            or self.steps >= self.max_steps
-        ):
+        if collision or self.steps >= self.max_steps:
             self.done = True
             reward = -10.0  # Penalty for dying
 
@@ -114,29 +181,17 @@ class SnakeGameEnv:
                 reward += 0.1 * (1.0 / (dist_to_food + 1))
 
         self.steps += 1
-        return self._get_state(), reward, self.done
-
-    def _get_state(self):
-        # Create a state representation
-        state = np.zeros((self.grid_size, self.grid_size, 3), dtype=np.float32)
-
-        # Mark the snake body
-        for i, j in self.snake:
-            if 0 <= i < self.grid_size and 0 <= j < self.grid_size:
-                state[i, j, 0] = 1.0
-
-        # Mark the snake head
-        head_i, head_j = self.head
-        if 0 <= head_i < self.grid_size and 0 <= head_j < self.grid_size:
-            state[head_i, head_j, 1] = 1.0
-
-        # Mark the food
-        if self.food:
-            food_i, food_j = self.food
-            state[food_i, food_j, 2] = 1.0
-
-        # Flatten the state to a 1D array
-        return state.flatten()
+        return self._get_state(out), reward, self.done
+
+    def _get_state(self, out=None):
+        # The buffer already holds the current state; hand it out without repainting.
+        # With out, the flat state is written into the caller's array instead
+        if out is not None:
+            out[:] = self._flat_observation
+            return out
+        if self.observation_mode == "view":
+            return self._flat_observation
+        return self._flat_observation.copy()
 
     def render(self, mode="human"):
         self.render_mode = mode
@@ -239,6 +294,142 @@ class SnakeGameEnv:
             self.pygame_initialized = False
 
 
+# Batched Snake environment: N games advanced per call with array operations
+class VecSnakeEnv:
+    # Movement directions: up, right, down, left (same order as SnakeGameEnv.step)
+    DIRECTIONS = np.array([(-1, 0), (0, 1), (1, 0), (0, -1)])
+    TURNS = np.array([0, -1, 1])  # Actions: continue, turn left, turn right
+
+    def __init__(self, num_envs, grid_size=10, seed=None):
+        self.num_envs = num_envs
+        self.grid_size = grid_size
+        self.num_cells = grid_size * grid_size
+        self.max_steps = 100 * grid_size  # Prevent infinite games
+        self.rng = np.random.default_rng(seed)
+
+        # Bodies are ring buffers of flat cell indices; head_ptr/tail_ptr index into each row.
+        # One spare slot because the new head is pushed before the tail is popped
+        self.capacity = self.num_cells + 1
+        self.bodies = np.zeros((num_envs, self.capacity), dtype=np.int64)
+        self.head_ptr = np.zeros(num_envs, dtype=np.int64)
+        self.tail_ptr = np.zeros(num_envs, dtype=np.int64)
+
+        # Per-game occupancy grids and observations, flattened over cells
+        self.occupied = np.zeros((num_envs, self.num_cells), dtype=bool)
+        self.observations = np.zeros((num_envs, self.num_cells, 3), dtype=np.float32)
+
+        self.heads = np.zeros(num_envs, dtype=np.int64)
+        self.food = np.full(num_envs, -1, dtype=np.int64)  # -1 when the grid is full
+        self.directions = np.zeros(num_envs, dtype=np.int64)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self.scores = np.zeros(num_envs, dtype=np.int64)
+
+        self.reset()
+
+    def reset(self):
+        # Reset every game
+        self._reset_games(np.arange(self.num_envs))
+        return self._get_states()
+
+    def _reset_games(self, games):
+        # Snake at the center of the grid heading right, food on a random empty cell
+        center = (self.grid_size // 2) * self.grid_size + self.grid_size // 2
+        self.occupied[games] = False
+        self.observations[games] = 0.0
+        self.bodies[games, 0] = center
+        self.head_ptr[games] = 0
+        self.tail_ptr[games] = 0
+        self.heads[games] = center
+        self.occupied[games, center] = True
+        self.observations[games, center, :2] = 1.0
+        self.directions[games] = 1
+        self.steps[games] = 0
+        self.scores[games] = 0
+        self.food[games] = -1
+        self._place_food(games)
+
+    def _place_food(self, games):
+        # Uniform choice among free cells: random keys with occupied cells masked out
+        keys = self.rng.random((len(games), self.num_cells))
+        keys[self.occupied[games]] = -1.0
+        cells = keys.argmax(axis=1)
+        has_free = keys[np.arange(len(games)), cells] >= 0.0
+
+        old = self.food[games]
+        self.observations[games[old >= 0], old[old >= 0], 2] = 0.0
+        self.food[games] = np.where(has_free, cells, -1)
+        self.observations[games[has_free], cells[has_free], 2] = 1.0
+
+    def step(self, actions):
+        games = np.arange(self.num_envs)
+        actions = np.asarray(actions, dtype=np.int64)
+
+        # Turn and move every head at once
+        self.directions = (self.directions + self.TURNS[actions]) % 4
+        rows, cols = np.divmod(self.heads, self.grid_size)
+        rows = rows + self.DIRECTIONS[self.directions, 0]
+        cols = cols + self.DIRECTIONS[self.directions, 1]
+        in_bounds = (rows >= 0) & (rows < self.grid_size) & (cols >= 0) & (cols < self.grid_size)
+        new_heads = np.where(in_bounds, rows * self.grid_size + cols, 0)
+        self.observations[games, self.heads, 1] = 0.0
+
+        # Pop the tail of every snake that did not eat
+        ate_food = in_bounds & (new_heads == self.food)
+        movers = games[~ate_food]
+        tails = self.bodies[movers, self.tail_ptr[movers]]
+        self.occupied[movers, tails] = False
+        self.observations[movers, tails, 0] = 0.0
+        self.tail_ptr[movers] = (self.tail_ptr[movers] + 1) % self.capacity
+
+        # Collision with boundaries or the body; the head is not marked yet
+        collision = ~in_bounds | self.occupied[games, new_heads]
+
+        # Push in-bounds heads, painted even on a self-collision for the final observation
+        pushed = games[in_bounds]
+        self.head_ptr[pushed] = (self.head_ptr[pushed] + 1) % self.capacity
+        self.bodies[pushed, self.head_ptr[pushed]] = new_heads[pushed]
+        self.heads[pushed] = new_heads[pushed]
+        self.observations[pushed, new_heads[pushed], :2] = 1.0
+        alive = games[~collision]
+        self.occupied[alive, new_heads[alive]] = True
+
+        self.scores += ate_food
+        eaters = games[ate_food & ~collision]
+        if len(eaters):
+            self._place_food(eaters)
+
+        dones = collision | (self.steps >= self.max_steps)
+
+        # Same reward shaping as SnakeGameEnv, measured from the new head
+        rewards = np.where(ate_food, 10.0, 0.0)
+        rewards[dones] = -10.0
+        head_rows, head_cols = np.divmod(new_heads, self.grid_size)
+        food_rows, food_cols = np.divmod(self.food, self.grid_size)
+        dist_to_food = np.abs(head_rows - food_rows) + np.abs(head_cols - food_cols)
+        shaping = 0.1 + np.where(self.food >= 0, 0.1 / (dist_to_food + 1), 0.0)
+        rewards[~dones] += shaping[~dones]
+
+        self.steps += 1
+
+        # Auto-reset finished games; their final observations and scores are kept in info
+        info = {}
+        if dones.any():
+            finished = games[dones]
+            info["terminal_states"] = self.observations[finished].reshape(len(finished), -1)
+            info["scores"] = self.scores[finished].copy()
+            self._reset_games(finished)
+
+        return self._get_states(), rewards, dones, info
+
+    def _get_states(self):
+        # Stacked flat observations, same layout as SnakeGameEnv._get_state
+        return self.observations.reshape(self.num_envs, -1).copy()
+
+    def close(self):
+        # Nothing is rendered, so there is nothing to release; kept for parity with SnakeGameEnv
+        pass
+
+
 # Deep Q-Network (DQN) Agent
 class DQNAgent:
     def __init__(self, state_size, action_size):
@@ -253,8 +444,15 @@ class DQNAgent:
         self.learning_rate = 0.001
         self.batch_size = 64
 
-        # Memory for experience replay
-        self.memory = deque(maxlen=10000)
+        # Memory for experience replay: preallocated columns used as a ring buffer
+        self.memory_capacity = 10000
+        self.memory_states = np.zeros((self.memory_capacity, state_size), dtype=np.float32)
+        self.memory_actions = np.zeros(self.memory_capacity, dtype=np.int64)
+        self.memory_rewards = np.zeros(self.memory_capacity, dtype=np.float32)
+        self.memory_next_states = np.zeros((self.memory_capacity, state_size), dtype=np.float32)
+        self.memory_dones = np.zeros(self.memory_capacity, dtype=bool)
+        self.memory_position = 0
+        self.memory_size = 0
 
         # Main model (trained every step)
         self.model = self._build_model()
@@ -263,6 +461,11 @@ class DQNAgent:
         self.target_model = self._build_model()
         self.update_target_model()
 
+        # Model used by act(); becomes a separate copy when a learner thread trains self.model
+        self.acting_model = self.model
+        self.memory_lock = threading.Lock()
+        self.weights_lock = threading.Lock()
+
     def _build_model(self):
         model = keras.Sequential(
             [
@@ -281,44 +484,91 @@ class DQNAgent:
         # Copy weights from model to target_model
         self.target_model.set_weights(self.model.get_weights())
 
+    def use_separate_acting_model(self):
+        # Act with a published copy of the weights so training never blocks acting
+        self.acting_model = self._build_model()
+        self.publish_weights()
+
+    def publish_weights(self):
+        # Copy the trained weights to the acting model
+        weights = self.model.get_weights()
+        with self.weights_lock:
+            self.acting_model.set_weights(weights)
+
     def remember(self, state, action, reward, next_state, done):
-        # Store experience in memory
-        self.memory.append((state, action, reward, next_state, done))
+        with self.memory_lock:
+            self._store(state, action, reward, next_state, done)
+
+    def _store(self, state, action, reward, next_state, done):
+        # Store experience in memory, overwriting the oldest once full
+        i = self.memory_position
+        self.memory_states[i] = state
+        self.memory_actions[i] = action
+        self.memory_rewards[i] = reward
+        self.memory_next_states[i] = next_state
+        self.memory_dones[i] = done
+        self.memory_position = (i + 1) % self.memory_capacity
+        self.memory_size = min(self.memory_size + 1, self.memory_capacity)
+
+    def remember_batch(self, states, actions, rewards, next_states, dones):
+        with self.memory_lock:
+            self._store_batch(states, actions, rewards, next_states, dones)
+
+    def _store_batch(self, states, actions, rewards, next_states, dones):
+        # Store stacked experiences with one write per column
+        indices = (self.memory_position + np.arange(len(actions))) % self.memory_capacity
+        self.memory_states[indices] = states
+        self.memory_actions[indices] = actions
+        self.memory_rewards[indices] = rewards
+        self.memory_next_states[indices] = next_states
+        self.memory_dones[indices] = dones
+        self.memory_position = int(indices[-1] + 1) % self.memory_capacity
+        self.memory_size = min(self.memory_size + len(actions), self.memory_capacity)
 
     def act(self, state, training=True):
         # Epsilon-greedy action selection
         if training and np.random.rand() <= self.epsilon:
             return random.randrange(self.action_size)
 
-        act_values = self.model.predict(np.array([state]), verbose=0)
+        with self.weights_lock:
+            act_values = self.acting_model.predict(np.array([state]), verbose=0)
         return np.argmax(act_values[0])
 
+    def act_batch(self, states, training=True):
+        # Epsilon-greedy actions for stacked states with a single forward pass
+        with self.weights_lock:
+            act_values = self.acting_model.predict_on_batch(np.asarray(states))
+        actions = np.argmax(act_values, axis=1)
+        if training:
+            explore = np.random.rand(len(actions)) <= self.epsilon
+            actions[explore] = np.random.randint(self.action_size, size=explore.sum())
+        return actions
+
     def replay(self):
-        if len(self.memory) < self.batch_size:
+        if self.memory_size < self.batch_size:
             return
-
-        # Sample a batch from memory
-        minibatch = random.sample(self.memory, self.batch_size)
-
-        # Extract data
-        states = np.array([m[0] for m in minibatch])
-        actions = np.array([m[1] for m in minibatch])
-        rewards = np.array([m[2] for m in minibatch])
-        next_states = np.array([m[3] for m in minibatch])
-        dones = np.array([m[4] for m in minibatch])
-
-        # Compute target Q values
-        target = self.model.predict(states, verbose=0)
-        target_next = self.target_model.predict(next_states, verbose=0)
-
-        for i in range(self.batch_size):
-            if dones[i]:
-                target[i, actions[i]] = rewards[i]
-            else:
-                target[i, actions[i]] = rewards[i] + self.gamma * np.max(target_next[i])
-
-        # Train the model
-        self.model.fit(states, target, epochs=1, verbose=0)
+        self.learn(*self.sample())
+
+    def sample(self):
+        # Sample a batch of indices and gather each column
+        with self.memory_lock:
+            indices = np.random.randint(0, self.memory_size, size=self.batch_size)
+            return (
+                self.memory_states[indices],
+                self.memory_actions[indices],
+                self.memory_rewards[indices],
+                self.memory_next_states[indices],
+                self.memory_dones[indices],
+            )
+
+    def learn(self, states, actions, rewards, next_states, dones):
+        # Compute target Q values; terminal transitions are masked out of the bootstrap
+        target = np.array(self.model.predict_on_batch(states))
+        target_next = np.asarray(self.target_model.predict_on_batch(next_states))
+        target[np.arange(self.batch_size), actions] = rewards + self.gamma * np.max(target_next, axis=1) * ~dones
+
+        # Train the model with one gradient step on the batch
+        self.model.train_on_batch(states, target)
 
         # Decay epsilon
         if self.epsilon > self.epsilon_min:
@@ -379,6 +629,178 @@ def train_dqn_agent(episodes=500, grid_size=10, render_freq=50, render_mode="pyg
     return agent, scores
 
 
+def train_dqn_agent_vec(episodes=500, grid_size=10, num_envs=16, render_freq=50):
+    # Train on num_envs games stepped together by VecSnakeEnv; one replay per batched step.
+    # Progress is printed every render_freq finished episodes (the games are not rendered)
+    env = VecSnakeEnv(num_envs, grid_size=grid_size)
+    state_size = env.num_cells * 3  # State representation size
+    action_size = 3  # Actions: continue, turn left, turn right
+
+    agent = DQNAgent(state_size, action_size)
+
+    scores = []
+    update_target_freq = 5  # Update target model every 5 episodes
+    next_target_update = update_target_freq
+    save_freq = 100  # Save the model every 100 episodes
+    next_save = 0
+    next_print = 0
+
+    states = env.reset()
+    while len(scores) < episodes:
+        actions = agent.act_batch(states)
+        next_states, rewards, dones, info = env.step(actions)
+
+        # Finished games were reset, so their real next states are in info
+        final_states = next_states.copy()
+        final_states[dones] = info.get("terminal_states", final_states[dones])
+        agent.remember_batch(states, actions, rewards, final_states, dones)
+        states = next_states
+
+        agent.replay()
+
+        if dones.any():
+            scores.extend(int(score) for score in info["scores"])
+
+        # Several games can finish in one step, so each milestone fires once it is passed
+        if len(scores) > next_print:
+            print(f"Episode: {len(scores)}/{episodes}, Score: {scores[-1]}, Epsilon: {agent.epsilon:.2f}")
+            next_print += render_freq
+
+        if len(scores) >= next_target_update:
+            agent.update_target_model()
+            next_target_update += update_target_freq
+
+        if len(scores) > next_save:
+            agent.save(f"snake_model_ep{next_save}.h5")
+            next_save += save_freq
+
+    env.close()
+    return agent, scores[:episodes]
+
+
+def train_dqn_agent_async(episodes=500, grid_size=10, steps_per_update=1, max_lag=50, publish_freq=20,
+                          render_freq=50, render_mode="pygame"):
+    # A learner thread trains on replay memory while this thread steps the game with the last
+    # published weights. The acting loop waits once it is max_lag updates ahead, and the learner
+    # waits for steps_per_update new env steps per update, so the ratio stays bounded both ways
+    if steps_per_update < 1 or publish_freq < 1:
+        raise ValueError("steps_per_update and publish_freq must be at least 1")
+    if max_lag < 1:
+        # With no lag the actor would wait for an update the learner cannot make yet
+        raise ValueError("max_lag must be at least 1")
+    env = SnakeGameEnv(grid_size=grid_size)
+    state_size = env.grid_size * env.grid_size * 3  # State representation size
+    action_size = 3  # Actions: continue, turn left, turn right
+
+    agent = DQNAgent(state_size, action_size)
+    agent.use_separate_acting_model()
+
+    scores = []
+    update_target_freq = 5  # Update target model every 5 episodes
+
+    # Shared counters, guarded by progress
+    progress = threading.Condition()
+    counters = {"env_steps": 0, "updates": 0, "target_updates": 0, "stop": False}
+    learner_errors = []
+
+    def learner():
+        try:
+            target_updates = 0
+            while True:
+                with progress:
+                    progress.wait_for(lambda: counters["stop"] or (
+                        agent.memory_size >= agent.batch_size
+                        and (counters["updates"] + 1) * steps_per_update <= counters["env_steps"]))
+                    if counters["stop"]:
+                        return
+                    requested_target_updates = counters["target_updates"]
+
+                # The target model is only touched from this thread
+                if target_updates < requested_target_updates:
+                    agent.update_target_model()
+                    target_updates = requested_target_updates
+
+                agent.learn(*agent.sample())
+
+                with progress:
+                    counters["updates"] += 1
+                    updates = counters["updates"]
+                    progress.notify_all()
+                if updates % publish_freq == 0:
+                    agent.publish_weights()
+        except Exception as error:
+            learner_errors.append(error)
+            with progress:
+                counters["stop"] = True
+                progress.notify_all()
+
+    learner_thread = threading.Thread(target=learner, name="snake-learner", daemon=True)
+    learner_thread.start()
+
+    try:
+        for e in range(episodes):
+            state = env.reset()
+            total_reward = 0
+
+            while not env.done:
+                # Wait while acting is too far ahead of learning
+                with progress:
+                    progress.wait_for(lambda: counters["stop"] or counters["env_steps"]
+                                      < agent.batch_size + steps_per_update * (counters["updates"] + max_lag))
+                    if counters["stop"]:
+                        break
+
+                action = agent.act(state)
+                next_state, reward, done = env.step(action)
+                agent.remember(state, action, reward, next_state, done)
+                state = next_state
+                total_reward += reward
+
+                with progress:
+                    counters["env_steps"] += 1
+                    progress.notify_all()
+
+                if e % render_freq == 0:
+                    env.render(mode=render_mode)
+                    time.sleep(0.05)  # Slower for visualization
+
+                if done:
+                    if e % render_freq == 0:
+                        print(
+                            f"Episode: {e}/{episodes}, Score: {env.score}, Epsilon: {agent.epsilon:.2f}, "
+                            f"Updates: {counters['updates']}"
+                        )
+                    break
+
+            if learner_errors:
+                break
+
+            # Ask the learner to update the target network every few episodes
+            if e % update_target_freq == 0:
+                with progress:
+                    counters["target_updates"] += 1
+
+            scores.append(env.score)
+
+            # Save the published weights every 100 episodes
+            if e % 100 == 0:
+                with agent.weights_lock:
+                    agent.acting_model.save_weights(f"snake_model_ep{e}.h5")
+    finally:
+        with progress:
+            counters["stop"] = True
+            progress.notify_all()
+        learner_thread.join()
+
+    if learner_errors:
+        raise learner_errors[0]
+
+    # Leave the agent acting with its final weights
+    agent.publish_weights()
+    env.close()
+    return agent, scores
+
+
 def evaluate_agent(agent, episodes=20, grid_size=10, render_mode="pygame"):
     env = SnakeGameEnv(grid_size=grid_size)
     scores = []
@@ -455,7 +877,7 @@ def human_play(grid_size=10):
 
 
 if __name__ == "__main__":
-    # Choose mode: 'train', 'eval', 'human', 'train_and_eval'
+    # Choose mode: 'train', 'train_vec', 'train_async', 'eval', 'human', 'train_and_eval'
     mode = "train_and_eval"
 
     if mode == "train":
@@ -476,6 +898,18 @@ if __name__ == "__main__":
         plt.savefig("training_progress.png")
         plt.show()
 
+    elif mode == "train_vec":
+        # Train on a batch of games stepped together
+        trained_agent, training_scores = train_dqn_agent_vec(episodes=300, grid_size=10, num_envs=16, render_freq=50)
+        trained_agent.save("snake_model_final.h5")
+
+    elif mode == "train_async":
+        # Train with a learner thread running alongside the game loop
+        trained_agent, training_scores = train_dqn_agent_async(
+            episodes=300, grid_size=10, render_freq=50, render_mode="pygame"
+        )
+        trained_agent.save("snake_model_final.h5")
+
     elif mode == "eval":
         # Load and evaluate a trained model
         env = SnakeGameEnv(grid_size=10)